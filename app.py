@@ -1,9 +1,12 @@
 import os
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 from src.api.routes import router, def_static_files, def_textures_files
 import uvicorn
 
 app = FastAPI()
+# Compress HTTP responses such as the /api/compute JSON; websocket frames are not affected
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 # Mount static files and router
 app.mount("/static", def_static_files, name="static")
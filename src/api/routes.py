@@ -1,20 +1,30 @@
 import asyncio
+import copy
+import hashlib
 import json
 import os
 import time
 import logging
 import traceback
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Response, Body
+from collections import OrderedDict
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Request, Response, Body
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
-from src.simulation.simulation import Plant
+from src.simulation.simulation import Plant, DEFAULT_RTOL, DEFAULT_ATOL
 from src.simulation.orbit import get_sid_time, earth_spin_rate_radps
 from datetime import datetime, timezone
 import math
 import numpy as np
+import orjson
 import yaml
 import glob
 
+# Prefer the libyaml C bindings for parsing configs; fall back to the pure-Python loader
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 router = APIRouter()
 
 # Ensure logs directory exists
@@ -26,42 +36,95 @@ TEXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "textures")
 def_static_files = StaticFiles(directory=STATIC_DIR, html=True)
 def_textures_files = StaticFiles(directory=TEXTURES_DIR, html=False)
 
+# Order of the per-field binary frames sent over the websocket
+DATASET_FIELDS = ("t", "qx", "qy", "qz", "qw", "p", "q", "r", "hx", "hy", "hz")
+# Little-endian wire dtype of each frame: float32 would leave a 30 Hz time axis only
+# ~1 ms apart at t ~ 1e4 s, so t keeps float64
+DATASET_DTYPES = ("<f8",) + ("<f4",) * (len(DATASET_FIELDS) - 1)
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+
+# Files served from fixed routes, resolved once at import
+_PAGE_FILES = {
+    "/": os.path.join(STATIC_DIR, "config.html"),
+    "/simulation": os.path.join(STATIC_DIR, "index.html"),
+    "/loading": os.path.join(STATIC_DIR, "loading.html"),
+    "/logo.png": os.path.join(ROOT_DIR, "logo.png"),
+    "/apple-touch-icon.png": os.path.join(ROOT_DIR, "apple-touch-icon.png"),
+    "/favicon-32x32.png": os.path.join(ROOT_DIR, "favicon-32x32.png"),
+    "/favicon-16x16.png": os.path.join(ROOT_DIR, "favicon-16x16.png"),
+    "/site.webmanifest": os.path.join(ROOT_DIR, "site.webmanifest"),
+}
+
+_CACHE_CONTROL = "public, max-age=3600"
+
+
+# Content ETags keyed by path, as ((st_mtime_ns, st_size), etag)
+_etag_cache: dict[str, tuple[tuple[int, int], str]] = {}
+
+
+def _etag(path: str):
+    """SHA-1 ETag of a file, rehashed only when its mtime or size changes.
+    Returns None if the file cannot be read."""
+    try:
+        st = os.stat(path)
+        key = (st.st_mtime_ns, st.st_size)
+        cached = _etag_cache.get(path)
+        if cached is None or cached[0] != key:
+            with open(path, "rb") as f:
+                cached = (key, '"' + hashlib.sha1(f.read()).hexdigest() + '"')
+            _etag_cache[path] = cached
+    except OSError:
+        return None
+    return cached[1]
+
+
+def _cached_file(route: str, request: Request):
+    path = _PAGE_FILES[route]
+    etag = _etag(path)
+    headers = {"Cache-Control": _CACHE_CONTROL}
+    if etag is not None:
+        headers["ETag"] = etag
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+    return FileResponse(path, headers=headers)
+
 @router.get("/")
-async def serve_config():
-    return FileResponse(os.path.join(STATIC_DIR, "config.html"))
+async def serve_config(request: Request):
+    return _cached_file("/", request)
 
 @router.get("/simulation")
-async def serve_index():
-    return FileResponse(os.path.join(STATIC_DIR, "index.html"))
+async def serve_index(request: Request):
+    return _cached_file("/simulation", request)
 
 @router.get("/loading")
-async def serve_loading():
-    return FileResponse(os.path.join(STATIC_DIR, "loading.html"))
+async def serve_loading(request: Request):
+    return _cached_file("/loading", request)
 
 @router.head("/")
 async def serve_index_head():
     return Response(status_code=200)
 
 @router.get("/logo.png")
-async def serve_logo():
-    return FileResponse(os.path.join(os.path.dirname(__file__), "..", "..", "logo.png"))
+async def serve_logo(request: Request):
+    return _cached_file("/logo.png", request)
 
 # Favicons and manifest at root
 @router.get("/apple-touch-icon.png")
-async def serve_apple_touch():
-    return FileResponse(os.path.join(os.path.dirname(__file__), "..", "..", "apple-touch-icon.png"))
+async def serve_apple_touch(request: Request):
+    return _cached_file("/apple-touch-icon.png", request)
 
 @router.get("/favicon-32x32.png")
-async def serve_favicon_32():
-    return FileResponse(os.path.join(os.path.dirname(__file__), "..", "..", "favicon-32x32.png"))
+async def serve_favicon_32(request: Request):
+    return _cached_file("/favicon-32x32.png", request)
 
 @router.get("/favicon-16x16.png")
-async def serve_favicon_16():
-    return FileResponse(os.path.join(os.path.dirname(__file__), "..", "..", "favicon-16x16.png"))
+async def serve_favicon_16(request: Request):
+    return _cached_file("/favicon-16x16.png", request)
 
 @router.get("/site.webmanifest")
-async def serve_manifest():
-    return FileResponse(os.path.join(os.path.dirname(__file__), "..", "..", "site.webmanifest"))
+async def serve_manifest(request: Request):
+    return _cached_file("/site.webmanifest", request)
 
 @router.get("/ga.js")
 async def serve_ga_js():
@@ -88,7 +151,32 @@ async def healthz():
     return {"status": "ok"}
 
 
-def _load_defaults() -> dict:
+# Parsed YAML files keyed by path, as (st_mtime_ns, data)
+_yaml_cache: dict[str, tuple[int, dict]] = {}
+# Assembled /api/presets listing, keyed by the (path, st_mtime_ns) of every preset file
+_presets_cache: dict = {"key": None, "data": None}
+
+
+def _read_yaml_sync(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_Loader)
+
+
+async def _read_yaml(path: str):
+    """Parse a YAML file, reusing the previous parse while its mtime is unchanged.
+    Cache misses are read and parsed in a worker thread so the event loop keeps serving.
+    Returns a deep copy so callers may mutate the result without poisoning the cache."""
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _yaml_cache.get(path)
+    if cached is None or cached[0] != mtime_ns:
+        data = await asyncio.to_thread(_read_yaml_sync, path)
+        _yaml_cache[path] = (mtime_ns, data)
+    else:
+        data = cached[1]
+    return copy.deepcopy(data)
+
+
+async def _load_defaults() -> dict:
     # Prefer Markley preset as default; fall back to intermediate axis preset, then legacy
     cfg_dir = os.path.join(os.path.dirname(__file__), "..", "..", "configs")
     root_markley = os.path.join(cfg_dir, "config_markley_7_1.yaml")
@@ -106,13 +194,12 @@ def _load_defaults() -> dict:
         else:
             raise FileNotFoundError("No configuration file found in the 'configs' directory.")
 
-    with open(config_path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    return await _read_yaml(config_path)
 
 
 @router.get("/api/defaults")
 async def api_defaults():
-    cfg = _load_defaults()
+    cfg = await _load_defaults()
     return {
         "spacecraft": {
             "inertia": cfg["spacecraft"]["inertia"],
@@ -128,8 +215,8 @@ async def api_defaults():
             "t_max": cfg["simulation"].get("t_max", 1000.0),
             "playback_speed": cfg["simulation"].get("playback_speed", 1.0),
             "sample_rate": cfg["simulation"].get("sample_rate", 30.0),
-            "rtol": cfg["simulation"].get("rtol", 1.0e-12),
-            "atol": cfg["simulation"].get("atol", 1.0e-12),
+            "rtol": cfg["simulation"].get("rtol", DEFAULT_RTOL),
+            "atol": cfg["simulation"].get("atol", DEFAULT_ATOL),
         },
         "control": {
             "control_type": cfg.get("control", {}).get("control_type", "none"),
@@ -139,14 +226,26 @@ async def api_defaults():
         },
     }
 
+def _mtime_ns(path: str):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
 @router.get("/api/presets")
 async def api_presets():
     cfg_dir = os.path.join(os.path.dirname(__file__), "..", "..", "configs")
+    paths = sorted(glob.glob(os.path.join(cfg_dir, "*.yaml")))
+    # Per-file mtimes also catch presets edited in place, which leave the directory
+    # mtime unchanged; adding or removing a file changes the path list
+    key = tuple((path, _mtime_ns(path)) for path in paths)
+    if _presets_cache["key"] == key:
+        return {"presets": _presets_cache["data"]}
     presets = []
-    for path in sorted(glob.glob(os.path.join(cfg_dir, "*.yaml"))):
+    for path in paths:
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
+            data = await _read_yaml(path) or {}
             name = data.get("name") or os.path.basename(path)
             presets.append({
                 "name": name,
@@ -154,6 +253,8 @@ async def api_presets():
             })
         except Exception:
             continue
+    _presets_cache["key"] = key
+    _presets_cache["data"] = presets
     return {"presets": presets}
 
 @router.get("/api/presets/{filename}")
@@ -166,44 +267,50 @@ async def api_preset_file(filename: str):
     path = os.path.join(cfg_dir, base)
     if not os.path.exists(path):
         return {"error": "preset not found"}
-    with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
-    return data
-
-
-def merge_with_defaults(payload: dict) -> dict:
-    cfg = _load_defaults()
-    inertia = payload.get("inertia")
-    shape = payload.get("shape")
-    q_bi = payload.get("q_bi")
-    omega_bi_radps = payload.get("omega_bi_radps")
-    dt_sim = payload.get("dt_sim")
-    t_max = payload.get("t_max")
-    playback_speed = payload.get("playback_speed")
-    sample_rate = payload.get("sample_rate")
-    rtol = payload.get("rtol")
-    atol = payload.get("atol")
-    if inertia is not None:
-        cfg["spacecraft"]["inertia"] = inertia
-    if shape is not None:
-        cfg["spacecraft"]["shape"] = shape
-    if q_bi is not None:
+    return await _read_yaml(path)
+
+
+# Flat payload keys and where they land in the config
+_MERGE_RULES = (
+    ("inertia", ("spacecraft", "inertia")),
+    ("shape", ("spacecraft", "shape")),
+    ("q_bi", ("initial_conditions", "q_bi")),
+    ("omega_bi_radps", ("initial_conditions", "omega_bi_radps")),
+    ("dt_sim", ("simulation", "dt_sim")),
+    ("t_max", ("simulation", "t_max")),
+    ("playback_speed", ("simulation", "playback_speed")),
+    ("sample_rate", ("simulation", "sample_rate")),
+    ("rtol", ("simulation", "rtol")),
+    ("atol", ("simulation", "atol")),
+)
+
+# control_type names accepted from clients, mapped to the identifiers used by dynamics;
+# anything else falls back to 0 (zero torque)
+_CTRL_MAP = {
+    "none": 0,
+    "zero_torque": 0,
+    "inertial": 1,
+    "inertial_linear": 1,
+    "tracking": 1,
+    "inertial_nonlinear": 2,
+    "nonlinear_tracking": 2,
+}
+
+
+def _setpath(cfg: dict, path: tuple, value) -> None:
+    section, key = path
+    cfg.setdefault(section, {})[key] = value
+
+
+async def merge_with_defaults(payload: dict) -> dict:
+    cfg = await _load_defaults()
+    for src, dst in _MERGE_RULES:
+        value = payload.get(src)
+        if value is not None:
+            _setpath(cfg, dst, value)
+    if payload.get("q_bi") is not None:
+        # An explicit attitude is always given in the inertial frame
         cfg["initial_conditions"]["frame"] = "inertial"
-        cfg["initial_conditions"]["q_bi"] = q_bi
-    if omega_bi_radps is not None:
-        cfg["initial_conditions"]["omega_bi_radps"] = omega_bi_radps
-    if dt_sim is not None:
-        cfg["simulation"]["dt_sim"] = dt_sim
-    if t_max is not None:
-        cfg["simulation"]["t_max"] = t_max
-    if playback_speed is not None:
-        cfg["simulation"]["playback_speed"] = playback_speed
-    if sample_rate is not None:
-        cfg["simulation"]["sample_rate"] = sample_rate
-    if rtol is not None:
-        cfg["simulation"]["rtol"] = rtol
-    if atol is not None:
-        cfg["simulation"]["atol"] = atol
 
     # Control parameters (flat or nested)
     ctrl_payload = payload.get("control", {}) if isinstance(payload.get("control"), dict) else payload
@@ -213,20 +320,9 @@ def merge_with_defaults(payload: dict) -> dict:
     kd = ctrl_payload.get("kd")
     qc = ctrl_payload.get("qc")
 
-    # Normalize control_type to internal identifiers used by dynamics
     if control_type is not None:
-        # Accept values: none | zero_torque | inertial | tracking | inertial_linear | inertial_nonlinear | nonlinear_tracking
-        ct = str(control_type).lower().strip()
-        if ct in ("none", "zero_torque"):
-            mapped = 0
-        elif ct in ("inertial_nonlinear", "nonlinear_tracking"):
-            mapped = 2
-        elif ct in ("inertial", "inertial_linear", "tracking"):
-            mapped = 1
-        else:
-            mapped = 0
-        cfg["control"] = cfg.get("control", {})
-        cfg["control"]["control_type"] = mapped
+        mapped = _CTRL_MAP.get(str(control_type).lower().strip(), 0)
+        cfg.setdefault("control", {})["control_type"] = mapped
     if kp is not None:
         cfg.setdefault("control", {})["kp"] = float(kp)
     if kd is not None:
@@ -249,42 +345,85 @@ def _bytes_human(n: int) -> str:
         return str(n)
 
 
+# Solver outputs for recently computed configurations, most recently used last
+_SOLVER_CACHE_SIZE = 8
+_solver_cache: "OrderedDict[str, tuple[Plant, np.ndarray, np.ndarray]]" = OrderedDict()
+
+
+def _compute_args(sim_config: dict) -> dict:
+    """Keyword arguments for Plant.compute_states from a merged configuration."""
+    sim = sim_config.get("simulation", {})
+    args = {
+        "t_max": float(sim.get("t_max", 1000.0)),
+        "rtol": float(sim.get("rtol", DEFAULT_RTOL)),
+        "atol": float(sim.get("atol", DEFAULT_ATOL)),
+    }
+    ctrl = sim_config.get("control", {})
+    control_type = ctrl.get("control_type")
+    qc_list = ctrl.get("qc")
+    if control_type is not None and qc_list:
+        args["control_type"] = control_type
+        args["kp"] = float(ctrl.get("kp", 0.0))
+        args["kd"] = float(ctrl.get("kd", 0.0))
+        args["qc"] = np.array(qc_list, dtype=float)
+    return args
+
+
+def _solver_cache_key(sim_config: dict, args: dict):
+    """Content hash of everything that affects the solver output.
+    Playback settings only affect resampling and are left out. Returns None if the
+    configuration cannot be serialized, in which case the result is not cached."""
+    relevant = {
+        "spacecraft": sim_config.get("spacecraft"),
+        "initial_conditions": sim_config.get("initial_conditions"),
+        "dt_sim": sim_config.get("simulation", {}).get("dt_sim"),
+        "args": args,
+    }
+    try:
+        blob = orjson.dumps(relevant, option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    except orjson.JSONEncodeError:
+        return None
+    return hashlib.blake2b(blob).hexdigest()
+
+
+async def _solve(sim_config: dict):
+    """Integrate the configured plant, reusing the output of an identical earlier request.
+    Returns (plant, t, y, t_compute, cache_hit)."""
+    args = _compute_args(sim_config)
+    key = _solver_cache_key(sim_config, args)
+    t0 = time.perf_counter()
+    cached = _solver_cache.get(key) if key is not None else None
+    if cached is not None:
+        _solver_cache.move_to_end(key)
+        plant, t, y = cached
+        return plant, t, y, time.perf_counter() - t0, True
+
+    plant = Plant(config=sim_config)
+    t, y = await asyncio.to_thread(plant.compute_states, **args)
+    t_compute = time.perf_counter() - t0
+    if key is not None:
+        # Shared between requests from here on
+        t.setflags(write=False)
+        y.setflags(write=False)
+        _solver_cache[key] = (plant, t, y)
+        while len(_solver_cache) > _SOLVER_CACHE_SIZE:
+            _solver_cache.popitem(last=False)
+    return plant, t, y, t_compute, False
+
+
 @router.post("/api/compute")
 async def api_compute(config: dict = Body(default={})):  # type: ignore[assignment]
     try:
-        sim_config = merge_with_defaults(config or {})
-        plant = Plant(config=sim_config)
+        sim_config = await merge_with_defaults(config or {})
         sim = sim_config.get("simulation", {})
-        t_max = float(sim.get("t_max", 1000.0))
-        rtol = float(sim.get("rtol", 1.0e-12))
-        atol = float(sim.get("atol", 1.0e-12))
         playback_speed = float(sim.get("playback_speed", 1.0))
         sample_rate = float(sim.get("sample_rate", 30.0))
-        
-        # Control
-        ctrl = sim_config.get("control", {})
-        control_type = ctrl.get("control_type")
-        kp = float(ctrl.get("kp", 0.0))
-        kd = float(ctrl.get("kd", 0.0))
-        qc_list = ctrl.get("qc")
-
-        # Prepare arguments for compute_states
-        args = {"t_max": t_max, "rtol": rtol, "atol": atol}
-        if control_type is not None and qc_list:
-            args["control_type"] = control_type
-            args["kp"] = kp
-            args["kd"] = kd
-            args["qc"] = np.array(qc_list, dtype=float)
-
-        t0 = time.perf_counter()
-        t, y = plant.compute_states(**args)
-        t_compute = time.perf_counter() - t0
-        t_s, r_s, v_s, eul_s, w_s, q_s, h_s = plant.evaluate_gui(t, y, playback_speed=playback_speed, sample_rate=sample_rate)
-        # Quaternion components (scalar last): qx, qy, qz, qw
-        qx_arr = q_s[0, :].tolist()
-        qy_arr = q_s[1, :].tolist()
-        qz_arr = q_s[2, :].tolist()
-        qw_arr = q_s[3, :].tolist()
+
+        plant, t, y, t_compute, cache_hit = await _solve(sim_config)
+        t_s, r_s, v_s, eul_s, w_s, q_s, h_s = await asyncio.to_thread(
+            plant.evaluate_gui, t, y, playback_speed=playback_speed, sample_rate=sample_rate)
+        # orjson serializes C-contiguous rows directly; slerp output is column-major
+        q_s = np.ascontiguousarray(q_s)
         # Earth rotation parameters for orbit visualization
         try:
             input_time_str = None
@@ -300,24 +439,25 @@ async def api_compute(config: dict = Body(default={})):  # type: ignore[assignme
             spin_rate = 7.2921151e-5
 
         dataset = {
-            "t": t_s.tolist(),
-            "qx": qx_arr,
-            "qy": qy_arr,
-            "qz": qz_arr,
-            "qw": qw_arr,
-            "p": w_s[0, :].tolist(),
-            "q": w_s[1, :].tolist(),
-            "r": w_s[2, :].tolist(),
-            "hx": h_s[0, :].tolist(),
-            "hy": h_s[1, :].tolist(),
-            "hz": h_s[2, :].tolist(),
+            "t": t_s,
+            # Quaternion components (scalar last): qx, qy, qz, qw
+            "qx": q_s[0],
+            "qy": q_s[1],
+            "qz": q_s[2],
+            "qw": q_s[3],
+            "p": w_s[0],
+            "q": w_s[1],
+            "r": w_s[2],
+            "hx": h_s[0],
+            "hy": h_s[1],
+            "hz": h_s[2],
             "sample_rate": sample_rate,
             # Earth rotation parameters
             "earth_initial_sidereal_angle_rad": theta0_rad,
             "earth_spin_rate_radps": spin_rate,
         }
-        # Metrics
-        num_steps = int(t.shape[0])
+        # Metrics; t is the dt_sim output grid, the solver's own step count is kept on the plant
+        num_steps = plant.n_solver_steps
         # Low-overhead memory proxy: raw solver arrays size (pre-JSON)
         solver_bytes = int(getattr(t, 'nbytes', 0) + getattr(y, 'nbytes', 0))
         time_per_step = (t_compute / num_steps) if num_steps > 0 else 0.0
@@ -327,8 +467,10 @@ async def api_compute(config: dict = Body(default={})):  # type: ignore[assignme
             "time_per_integration_point_s": time_per_step,
             "solver_state_size_bytes": solver_bytes,
             "solver_state_size_readable": _bytes_human(solver_bytes),
+            "solver_cache_hit": cache_hit,
         }
-        return {"dataset": dataset, "metrics": metrics}
+        body = orjson.dumps({"dataset": dataset, "metrics": metrics}, option=orjson.OPT_SERIALIZE_NUMPY)
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         logging.error(traceback.format_exc())
         return {"error": str(e)}
@@ -362,7 +504,7 @@ async def websocket_endpoint(websocket: WebSocket):
                 elif command.get("command") == "configure":
                     print("Received simulation configuration.")
                     payload = command.get("payload", {})
-                    sim_config = merge_with_defaults(payload)
+                    sim_config = await merge_with_defaults(payload)
                     # Stash epoch_utc (string) for visualization parameters
                     try:
                         sim_config["_epoch_utc"] = payload.get("epoch_utc") if isinstance(payload, dict) else None
@@ -374,90 +516,65 @@ async def websocket_endpoint(websocket: WebSocket):
                 print(f"Received non-JSON message: {message}")
 
     async def sender():
-        # Wait for configuration from the client
-        await config_event.wait()
-        plant = Plant(config=sim_config)
-        # Precompute full trajectory and provide sampled dataset for GUI playback
-        sim = sim_config.get("simulation", {})
-        t_max = float(sim.get("t_max", 1000.0))
-        rtol = float(sim.get("rtol", 1.0e-12))
-        atol = float(sim.get("atol", 1.0e-12))
-        playback_speed = float(sim.get("playback_speed", 1.0))
-        sample_rate = float(sim.get("sample_rate", 30.0))
+        # Each configure message (re)triggers a run. Reconfigurations that only change
+        # playback settings reuse the cached solver output and just resample it.
+        while True:
+            await config_event.wait()
+            config_event.clear()
+            # Precompute full trajectory and provide sampled dataset for GUI playback
+            sim = sim_config.get("simulation", {})
+            playback_speed = float(sim.get("playback_speed", 1.0))
+            sample_rate = float(sim.get("sample_rate", 30.0))
 
-        try:
-            # Control
-            ctrl = sim_config.get("control", {})
-            control_type = ctrl.get("control_type")
-            kp = float(ctrl.get("kp", 0.0))
-            kd = float(ctrl.get("kd", 0.0))
-            qc_list = ctrl.get("qc")
-            
-            # Prepare arguments for compute_states
-            args = {"t_max": t_max, "rtol": rtol, "atol": atol}
-            if control_type is not None and qc_list:
-                args["control_type"] = control_type
-                args["kp"] = kp
-                args["kd"] = kd
-                args["qc"] = np.array(qc_list, dtype=float)
-
-            t0 = time.perf_counter()
-            t, y = plant.compute_states(**args)
-            t_compute = time.perf_counter() - t0
-            t_s, r_s, v_s, eul_s, w_s, q_s, h_s = plant.evaluate_gui(t, y, playback_speed=playback_speed, sample_rate=sample_rate)
-            # Quaternion components (scalar last): qx, qy, qz, qw
-            qx_arr = q_s[0, :].tolist()
-            qy_arr = q_s[1, :].tolist()
-            qz_arr = q_s[2, :].tolist()
-            qw_arr = q_s[3, :].tolist()
-            # Earth rotation parameters for orbit visualization (use provided epoch_utc if available)
             try:
-                input_time_str = sim_config.get("_epoch_utc")
-                if not input_time_str:
-                    input_time_str = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
-                theta0_deg = float(get_sid_time(input_time_str))
-                theta0_rad = math.radians(theta0_deg)
-                spin_rate = float(earth_spin_rate_radps(input_time_str))
-            except Exception:
-                theta0_rad = 0.0
-                spin_rate = 7.2921151e-5
-
-            dataset = {
-                "t": t_s.tolist(),
-                "qx": qx_arr,
-                "qy": qy_arr,
-                "qz": qz_arr,
-                "qw": qw_arr,
-                "p": w_s[0, :].tolist(),
-                "q": w_s[1, :].tolist(),
-                "r": w_s[2, :].tolist(),
-                "hx": h_s[0, :].tolist(),
-                "hy": h_s[1, :].tolist(),
-                "hz": h_s[2, :].tolist(),
-                "sample_rate": sample_rate,
-                # Earth rotation parameters
-                "earth_initial_sidereal_angle_rad": theta0_rad,
-                "earth_spin_rate_radps": spin_rate,
-            }
-            # Metrics
-            num_steps = int(t.shape[0])
-            solver_bytes = int(getattr(t, 'nbytes', 0) + getattr(y, 'nbytes', 0))
-            time_per_step = (t_compute / num_steps) if num_steps > 0 else 0.0
-            metrics = {
-                "compute_time_s": t_compute,
-                "num_integration_points": num_steps,
-                "time_per_integration_point_s": time_per_step,
-                "solver_state_size_bytes": solver_bytes,
-                "solver_state_size_readable": _bytes_human(solver_bytes),
-            }
-            await websocket.send_text(json.dumps({"dataset": dataset, "metrics": metrics}))
-        except Exception as e:
-            logging.error(traceback.format_exc())
-            await websocket.send_text(json.dumps({"error": str(e)}))
-
-        # Keep the connection alive to allow future reconfiguration if desired
-        while True:
-            await asyncio.sleep(1.0)
+                plant, t, y, t_compute, cache_hit = await _solve(sim_config)
+                t_s, r_s, v_s, eul_s, w_s, q_s, h_s = await asyncio.to_thread(
+                    plant.evaluate_gui, t, y, playback_speed=playback_speed, sample_rate=sample_rate)
+                # Earth rotation parameters for orbit visualization (use provided epoch_utc if available)
+                try:
+                    input_time_str = sim_config.get("_epoch_utc")
+                    if not input_time_str:
+                        input_time_str = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+                    theta0_deg = float(get_sid_time(input_time_str))
+                    theta0_rad = math.radians(theta0_deg)
+                    spin_rate = float(earth_spin_rate_radps(input_time_str))
+                except Exception:
+                    theta0_rad = 0.0
+                    spin_rate = 7.2921151e-5
+
+                # Sampled series in DATASET_FIELDS order
+                columns = (t_s, *q_s, *w_s, *h_s)
+                # Metrics
+                num_steps = plant.n_solver_steps
+                solver_bytes = int(getattr(t, 'nbytes', 0) + getattr(y, 'nbytes', 0))
+                time_per_step = (t_compute / num_steps) if num_steps > 0 else 0.0
+                metrics = {
+                    "compute_time_s": t_compute,
+                    "num_integration_points": num_steps,
+                    "time_per_integration_point_s": time_per_step,
+                    "solver_state_size_bytes": solver_bytes,
+                    "solver_state_size_readable": _bytes_human(solver_bytes),
+                    "solver_cache_hit": cache_hit,
+                }
+                # Header first (text), then one little-endian binary frame per field,
+                # so no single buffer holding the whole dataset is ever built
+                header = {
+                    "kind": "dataset",
+                    "fields": DATASET_FIELDS,
+                    "N": int(t_s.shape[0]),
+                    "dtypes": [np.dtype(d).name for d in DATASET_DTYPES],
+                    "sample_rate": sample_rate,
+                    # Earth rotation parameters
+                    "earth_initial_sidereal_angle_rad": theta0_rad,
+                    "earth_spin_rate_radps": spin_rate,
+                    "metrics": metrics,
+                }
+                await websocket.send_text(orjson.dumps(header).decode("utf-8"))
+                for column, dtype in zip(columns, DATASET_DTYPES):
+                    await websocket.send_bytes(column.astype(dtype).tobytes())
+            except Exception as e:
+                logging.error(traceback.format_exc())
+                await websocket.send_text(json.dumps({"error": str(e)}))
 
     try:
         await asyncio.gather(receiver(), sender())
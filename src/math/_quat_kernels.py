@@ -0,0 +1,132 @@
+"""Compiled scalar kernels behind the public helpers in quaternion.py.
+
+Every kernel takes flat float64 inputs ((4,) quaternions, scalar-last [x, y, z, w],
+or a (3, 3) matrix) and returns a freshly allocated array; quaternion.py adapts
+the (4,1) and (3,) shapes used elsewhere.
+"""
+import math
+import os
+def _identity_decorator(func=None, **kwargs):
+    if func is None:
+        return lambda f: f
+    return func
+if os.getenv("DISABLE_NUMBA", "0") == "1":
+    njit = _identity_decorator  # type: ignore[assignment]
+else:
+    try:
+        from numba import njit  # type: ignore
+    except Exception:
+        njit = _identity_decorator  # type: ignore[assignment]
+import numpy as np
+
+
+@njit(cache=True, fastmath=True)
+def _hamilton(q1: np.ndarray, q2: np.ndarray) -> np.ndarray:
+    """Quaternion ⊗ product q1 ⊗ q2, closed form of quat_multiply_cross_operator(q1) @ q2."""
+    x1, y1, z1, w1 = q1[0], q1[1], q1[2], q1[3]
+    x2, y2, z2, w2 = q2[0], q2[1], q2[2], q2[3]
+    out = np.empty(4)
+    out[0] = w1 * x2 + z1 * y2 - y1 * z2 + x1 * w2
+    out[1] = -z1 * x2 + w1 * y2 + x1 * z2 + y1 * w2
+    out[2] = y1 * x2 - x1 * y2 + w1 * z2 + z1 * w2
+    out[3] = -x1 * x2 - y1 * y2 - z1 * z2 + w1 * w2
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def _conj(q: np.ndarray) -> np.ndarray:
+    out = np.empty(4)
+    out[0] = -q[0]
+    out[1] = -q[1]
+    out[2] = -q[2]
+    out[3] = q[3]
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def _normalize(q: np.ndarray) -> np.ndarray:
+    """Unit quaternion along q; the zero quaternion maps to the identity."""
+    out = np.empty(4)
+    s = q[0] * q[0] + q[1] * q[1] + q[2] * q[2] + q[3] * q[3]
+    if s == 0.0:
+        out[0] = 0.0
+        out[1] = 0.0
+        out[2] = 0.0
+        out[3] = 1.0
+        return out
+    # One scalar sqrt and reciprocal, then four multiplies
+    inv = 1.0 / math.sqrt(s)
+    out[0] = q[0] * inv
+    out[1] = q[1] * inv
+    out[2] = q[2] * inv
+    out[3] = q[3] * inv
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def _quat_to_rotmatrix(q: np.ndarray) -> np.ndarray:
+    """Attitude matrix Xi(q)^T Psi(q), Markley (Eq. 2.129, p.46)."""
+    x, y, z, w = q[0], q[1], q[2], q[3]
+    ww, xx, yy, zz = w * w, x * x, y * y, z * z
+    xy, xz, yz = x * y, x * z, y * z
+    wx, wy, wz = w * x, w * y, w * z
+    A = np.empty((3, 3))
+    A[0, 0] = ww + xx - yy - zz
+    A[0, 1] = 2 * (xy + wz)
+    A[0, 2] = 2 * (xz - wy)
+    A[1, 0] = 2 * (xy - wz)
+    A[1, 1] = ww - xx + yy - zz
+    A[1, 2] = 2 * (yz + wx)
+    A[2, 0] = 2 * (xz + wy)
+    A[2, 1] = 2 * (yz - wx)
+    A[2, 2] = ww - xx - yy + zz
+    return A
+
+
+@njit(cache=True, fastmath=True)
+def _rotmat_to_quat(A: np.ndarray) -> np.ndarray:
+    """Quaternion from a rotation matrix, Markley (Eq. 2.135, p.48).
+
+    Shepperd's method: each candidate is 4 q_i^2 for one component, the largest is
+    picked once, the unscaled column is filled with plain sums/differences and a
+    single 1/(2 sqrt(c)) scale is applied at the end.
+    """
+    trA = A[0, 0] + A[1, 1] + A[2, 2]
+    c0 = 1.0 + trA
+    c1 = 1.0 + 2.0 * A[0, 0] - trA
+    c2 = 1.0 + 2.0 * A[1, 1] - trA
+    c3 = 1.0 + 2.0 * A[2, 2] - trA
+
+    # Ties resolve in the order trA, A11, A22, A33
+    idx = np.argmax(np.array([c0, c1, c2, c3]))
+    out = np.empty(4)
+    if idx == 0:
+        c = c0
+        out[0] = A[2, 1] - A[1, 2]
+        out[1] = A[0, 2] - A[2, 0]
+        out[2] = A[1, 0] - A[0, 1]
+        out[3] = c0
+    elif idx == 1:
+        c = c1
+        out[0] = c1
+        out[1] = A[0, 1] + A[1, 0]
+        out[2] = A[0, 2] + A[2, 0]
+        out[3] = A[1, 2] - A[2, 1]
+    elif idx == 2:
+        c = c2
+        out[0] = A[0, 1] + A[1, 0]
+        out[1] = c2
+        out[2] = A[1, 2] + A[2, 1]
+        out[3] = A[0, 2] - A[2, 0]
+    else:
+        c = c3
+        out[0] = A[0, 2] + A[2, 0]
+        out[1] = A[1, 2] + A[2, 1]
+        out[2] = c3
+        out[3] = A[0, 1] - A[1, 0]
+    scale = 0.5 / math.sqrt(c)
+    out[0] *= scale
+    out[1] *= scale
+    out[2] *= scale
+    out[3] *= scale
+    return out
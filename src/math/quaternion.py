@@ -1,3 +1,4 @@
+import math
 import os
 def _identity_decorator(func=None, **kwargs):
     if func is None:
@@ -5,17 +6,28 @@ def _identity_decorator(func=None, **kwargs):
     return func
 if os.getenv("DISABLE_NUMBA", "0") == "1":
     njit = _identity_decorator  # type: ignore[assignment]
+    prange = range
+    NUMBA_ENABLED = False
 else:
     try:
-        from numba import njit  # type: ignore
+        from numba import njit, prange  # type: ignore
+        NUMBA_ENABLED = True
     except Exception:
         njit = _identity_decorator  # type: ignore[assignment]
+        prange = range
+        NUMBA_ENABLED = False
 import numpy as np
 from scipy.spatial.transform import Rotation as R
 from scipy.spatial.transform import Slerp
 
+from ._quat_kernels import _hamilton, _conj, _normalize, _quat_to_rotmatrix, _rotmat_to_quat
 
-@njit
+# Identity quaternion as a flat (4,) array; read-only, so users take a copy
+_IDENTITY_Q = np.array([0.0, 0.0, 0.0, 1.0])
+_IDENTITY_Q.setflags(write=False)
+
+
+@njit(cache=True)
 def quat_psi(q: np.ndarray) -> np.ndarray:
     """The Psi(q) function for quaternions.
 
@@ -24,16 +36,25 @@ def quat_psi(q: np.ndarray) -> np.ndarray:
 
     Output: np.ndarray of shape (4,3)
     Source: Markley (Eq. 2.87, p.38)"""
-    q_flat = q.flatten()
-    return np.array([
-        [q_flat[3], q_flat[2], -q_flat[1]],
-        [-q_flat[2], q_flat[3], q_flat[0]],
-        [q_flat[1], -q_flat[0], q_flat[3]],
-        [-q_flat[0], -q_flat[1], -q_flat[2]]
-    ])
-
-
-@njit
+    q_flat = q.ravel()
+    qx, qy, qz, qw = q_flat[0], q_flat[1], q_flat[2], q_flat[3]
+    out = np.empty((4, 3), dtype=q.dtype)
+    out[0, 0] = qw
+    out[0, 1] = qz
+    out[0, 2] = -qy
+    out[1, 0] = -qz
+    out[1, 1] = qw
+    out[1, 2] = qx
+    out[2, 0] = qy
+    out[2, 1] = -qx
+    out[2, 2] = qw
+    out[3, 0] = -qx
+    out[3, 1] = -qy
+    out[3, 2] = -qz
+    return out
+
+
+@njit(cache=True)
 def quat_xi(q: np.ndarray) -> np.ndarray:
     """The Xi(q) function for quaternions.
 
@@ -42,16 +63,25 @@ def quat_xi(q: np.ndarray) -> np.ndarray:
 
     Output: np.ndarray of shape (4,3)
     Source: Markley (Eq. 2.88, p.38)"""
-    q_flat = q.flatten()
-    return np.array([
-        [q_flat[3], -q_flat[2], q_flat[1]],
-        [q_flat[2], q_flat[3], -q_flat[0]],
-        [-q_flat[1], q_flat[0], q_flat[3]],
-        [-q_flat[0], -q_flat[1], -q_flat[2]]
-    ])
-
-
-@njit
+    q_flat = q.ravel()
+    qx, qy, qz, qw = q_flat[0], q_flat[1], q_flat[2], q_flat[3]
+    out = np.empty((4, 3), dtype=q.dtype)
+    out[0, 0] = qw
+    out[0, 1] = -qz
+    out[0, 2] = qy
+    out[1, 0] = qz
+    out[1, 1] = qw
+    out[1, 2] = -qx
+    out[2, 0] = -qy
+    out[2, 1] = qx
+    out[2, 2] = qw
+    out[3, 0] = -qx
+    out[3, 1] = -qy
+    out[3, 2] = -qz
+    return out
+
+
+@njit(cache=True)
 def quat_multiply_cross_operator(q: np.ndarray) -> np.ndarray:
     """Quaternion ⊗ product matrix operator.
 
@@ -61,10 +91,13 @@ def quat_multiply_cross_operator(q: np.ndarray) -> np.ndarray:
     Output: np.ndarray of shape (4,4)
     Usage in the context of quaternion multiplication: quat_multiply_cross_operator(q1) @ q2
     Source: Markley (Eq. 2.85, p.38)"""
-    return np.hstack((quat_psi(q), q.reshape(4, 1)))
+    out = np.empty((4, 4), dtype=q.dtype)
+    out[:, :3] = quat_psi(q)
+    out[:, 3] = q.ravel()
+    return out
 
 
-@njit
+@njit(cache=True)
 def quat_multiply_dot_operator(q: np.ndarray) -> np.ndarray:
     """Quaternion ⨀ product matrix operator.
 
@@ -74,10 +107,13 @@ def quat_multiply_dot_operator(q: np.ndarray) -> np.ndarray:
     Output: np.ndarray of shape (4,4)
     Usage in the context of quaternion multiplication: quat_multiply_dot_operator(q1) @ q2
     Source: Markley (Eq. 2.86, p.38)"""
-    return np.hstack((quat_xi(q), q.reshape(4, 1)))
+    out = np.empty((4, 4), dtype=q.dtype)
+    out[:, :3] = quat_xi(q)
+    out[:, 3] = q.ravel()
+    return out
 
 
-@njit
+@njit(cache=True)
 def quat_normalize(q: np.ndarray) -> np.ndarray:
     """
     Get a normalized version of this quaternion.
@@ -88,61 +124,100 @@ def quat_normalize(q: np.ndarray) -> np.ndarray:
     Returns:
         A new normalized quaternion (original remains unchanged)
     """
-    n = np.linalg.norm(q)
-    if n == 0:
-        # Return identity quaternion
-        normalized_q = np.array([0.0, 0.0, 0.0, 1.0])
-    else:
-        normalized_q = q.flatten() / n
-    return normalized_q
+    return _normalize(q.ravel())
 
 
-@njit
+def quat_normalize_batch(Q: np.ndarray) -> np.ndarray:
+    """Normalize every column of a (4, N) quaternion array.
+
+    Zero-norm columns are replaced by the identity quaternion, as in quat_normalize.
+
+    Returns:
+        A new (4, N) array of unit quaternions (original remains unchanged)
+    """
+    n = np.sqrt(np.einsum('ij,ij->j', Q, Q))
+    bad = n == 0
+    n[bad] = 1.0
+    out = Q / n
+    out[:3, bad] = 0.0
+    out[3, bad] = 1.0
+    return out
+
+
+@njit(cache=True)
 def quat_norm(q: np.ndarray) -> float:
     """Get the norm (magnitude) of the quaternion."""
     return np.linalg.norm(q)
 
 
-@njit
+@njit(cache=True)
 def quat_is_normalized(q: np.ndarray) -> bool:
     """Check if the quaternion is normalized."""
     return np.isclose(quat_norm(q), 1.0)
 
 
-@njit
+@njit(cache=True)
 def quat_conj(q: np.ndarray) -> np.ndarray:
     """Get the conjugate of a quaternion."""
-    q_flat = q.flatten()
-    return np.array([-q_flat[0], -q_flat[1], -q_flat[2], q_flat[3]])
+    return _conj(q.ravel())
+
+
+@njit(cache=True)
+def _as_quat(q: np.ndarray) -> np.ndarray:
+    """Flat (4,) view of q; a 3-vector becomes a quaternion with zero scalar component."""
+    q_flat = q.ravel()
+    if q_flat.shape[0] == 3:
+        out = np.zeros(4)
+        out[:3] = q_flat
+        return out
+    return q_flat
 
 
-@njit
+@njit(cache=True)
 def quat_multiply_cross(q1: np.ndarray, q2: np.ndarray) -> np.ndarray:
     """Quaternion multiplication, defined as ⊗ operator from Markley.
-    If the second argument is a vector, it is treated as a quaternion with a zero scalar component."""
-    mat = quat_multiply_cross_operator(q1)
-    # Always return a flat (4,) array for consistency with Numba
-    if q2.shape == (3,) or q2.shape == (3, 1):
-        v4 = np.zeros(4)
-        v4[:3] = q2.flatten()
-        return (mat @ v4).reshape(4,)
-    return (mat @ q2.reshape(4,)).reshape(4,)
+    If the second argument is a vector, it is treated as a quaternion with a zero scalar component.
+    Always returns a flat (4,) array."""
+    return _hamilton(q1.ravel(), _as_quat(q2))
 
 
-@njit
+@njit(cache=True)
 def quat_multiply_dot(q1: np.ndarray, q2: np.ndarray) -> np.ndarray:
     """Quaternion multiplication, defined as ⊙ operator from Markley.
-    If the second argument is a vector, it is treated as a quaternion with a zero scalar component."""
-    mat = quat_multiply_dot_operator(q1)
-    # Always return a flat (4,) array for consistency with Numba
-    if q2.shape == (3,) or q2.shape == (3, 1):
-        v4 = np.zeros(4)
-        v4[:3] = q2.flatten()
-        return (mat @ v4).reshape(4,)
-    return (mat @ q2.reshape(4,)).reshape(4,)
-
-
-@njit
+    If the second argument is a vector, it is treated as a quaternion with a zero scalar component.
+    Always returns a flat (4,) array."""
+    # q1 ⊙ q2 = q2 ⊗ q1
+    return _hamilton(_as_quat(q2), q1.ravel())
+
+
+@njit(nogil=True, cache=True)
+def quat_multiply_cross_into(q1: np.ndarray, q2: np.ndarray, out: np.ndarray) -> None:
+    """Quaternion ⊗ product of two flat (4,) quaternions, written into out.
+
+    Closed form of quat_multiply_cross_operator(q1) @ q2 (Markley Eq. 2.85, p.38).
+    Compiled without the GIL, so simulation threads can run products concurrently.
+    out must not alias q1 or q2."""
+    x1, y1, z1, w1 = q1[0], q1[1], q1[2], q1[3]
+    x2, y2, z2, w2 = q2[0], q2[1], q2[2], q2[3]
+    out[0] = w1 * x2 + z1 * y2 - y1 * z2 + x1 * w2
+    out[1] = -z1 * x2 + w1 * y2 + x1 * z2 + y1 * w2
+    out[2] = y1 * x2 - x1 * y2 + w1 * z2 + z1 * w2
+    out[3] = -x1 * x2 - y1 * y2 - z1 * z2 + w1 * w2
+
+
+@njit(nogil=True, cache=True)
+def quat_multiply_cross_many(Q1: np.ndarray, Q2: np.ndarray, out: np.ndarray) -> None:
+    """Column-wise quaternion ⊗ product of two (4, N) arrays, written into out (4, N)."""
+    for i in range(Q1.shape[1]):
+        x1, y1, z1, w1 = Q1[0, i], Q1[1, i], Q1[2, i], Q1[3, i]
+        x2, y2, z2, w2 = Q2[0, i], Q2[1, i], Q2[2, i], Q2[3, i]
+        out[0, i] = w1 * x2 + z1 * y2 - y1 * z2 + x1 * w2
+        out[1, i] = -z1 * x2 + w1 * y2 + x1 * z2 + y1 * w2
+        out[2, i] = y1 * x2 - x1 * y2 + w1 * z2 + z1 * w2
+        out[3, i] = -x1 * x2 - y1 * y2 - z1 * z2 + w1 * w2
+
+
+@njit(cache=True)
 def quat_inv(q: np.ndarray) -> np.ndarray:
     """Inverse of a quaternion is the conjugate divided by the norm squared."""
     return quat_conj(q) / (quat_norm(q)**2)
@@ -152,17 +227,18 @@ def slerp(q0: np.ndarray, q1: np.ndarray, t: float) -> np.ndarray:
     """Spherical linear interpolation between two quaternions."""
     q0_n = quat_normalize(q0)
     q1_n = quat_normalize(q1)
-    dot = np.dot(q0_n.flatten(), q1_n.flatten())
+    dot = float(np.dot(q0_n.ravel(), q1_n.ravel()))
     if dot < 0:
         q1_n = -q1_n
         dot = -dot
     if dot > 0.9995:
         return (1 - t) * q0_n + t * q1_n
 
-    theta = np.arccos(dot)
-    s0 = np.sin(theta)
-    w1 = np.sin((1 - t) * theta) / s0
-    w2 = np.sin(t * theta) / s0
+    # Scalar trig through math avoids the per-call ufunc dispatch of np.arccos/np.sin
+    theta = math.acos(dot)
+    s0 = math.sin(theta)
+    w1 = math.sin((1 - t) * theta) / s0
+    w2 = math.sin(t * theta) / s0
     return w1 * q0_n + w2 * q1_n
 
 
@@ -188,49 +264,141 @@ def slerp_quat_array(t_sampled: np.ndarray, t0: np.ndarray, q0: np.ndarray) -> n
     Returns:
         (4, M) array of interpolated quaternions [x, y, z, w] across t_sampled
     """
-    rotations = R.from_quat(q0.T)
-    interpolator = Slerp(t0, rotations)
-    return interpolator(t_sampled).as_quat().T
-
-
+    t_sampled = np.ascontiguousarray(t_sampled, dtype=np.float64)
+    t0 = np.ascontiguousarray(t0, dtype=np.float64)
+    if t0.shape[0] < 2:
+        raise ValueError("`times` must contain at least 2 elements.")
+    if t_sampled.size and (t_sampled.min() < t0[0] or t_sampled.max() > t0[-1]):
+        raise ValueError("Interpolation times must be within the range "
+                         f"[{t0[0]}, {t0[-1]}], both inclusive.")
+    q0 = np.ascontiguousarray(q0, dtype=np.float64)
+    if NUMBA_ENABLED:
+        out = np.empty((4, t_sampled.shape[0]))
+        _slerp_quat_kernel(t_sampled, t0, q0, out)
+        return out
+    return slerp_quat_array_vec(t_sampled, t0, q0)
+
+
+def slerp_quat_array_vec(t_sampled: np.ndarray, t0: np.ndarray, q0: np.ndarray) -> np.ndarray:
+    """Vectorized NumPy equivalent of _slerp_quat_kernel, used when numba is unavailable.
+
+    All samples are processed at once: one searchsorted for the segment indices,
+    then broadcast slerp weights over the whole grid.
+    """
+    idx = np.searchsorted(t0, t_sampled, side='right') - 1
+    idx = np.clip(idx, 0, t0.shape[0] - 2)
+    qa = q0[:, idx]
+    qb = q0[:, idx + 1]
+    # Keyframes are normalized on the fly, as Rotation.from_quat does
+    qa = qa / np.sqrt(np.einsum('ij,ij->j', qa, qa))
+    qb = qb / np.sqrt(np.einsum('ij,ij->j', qb, qb))
+    u = (t_sampled - t0[idx]) / (t0[idx + 1] - t0[idx])
+
+    dot = np.einsum('ij,ij->j', qa, qb)
+    # Shortest path: flip the far keyframe where the quaternions lie in opposite hemispheres
+    sign = np.where(dot < 0.0, -1.0, 1.0)
+    dot = np.abs(dot)
+    theta = np.arccos(np.clip(dot, -1.0, 1.0))
+    s = np.sin(theta)
+    small = s < 1e-6
+    s_safe = np.where(small, 1.0, s)
+    w0 = np.where(small, 1.0 - u, np.sin((1.0 - u) * theta) / s_safe)
+    w1 = np.where(small, u, np.sin(u * theta) / s_safe) * sign
+
+    out = w0 * qa + w1 * qb
+    return out / np.sqrt(np.einsum('ij,ij->j', out, out))
+
+
+@njit(cache=True)
+def _slerp_quat_kernel(t_sampled: np.ndarray, t0: np.ndarray, q0: np.ndarray, out: np.ndarray) -> None:
+    """Shortest-path slerp of the keyframes q0 (4, N) at times t0, sampled at t_sampled,
+    written into out (4, M). Keyframes are normalized on the fly, as Rotation.from_quat does."""
+    n = t0.shape[0]
+    for i in range(t_sampled.shape[0]):
+        ti = t_sampled[i]
+        # Binary search for the segment [t0[lo], t0[lo + 1]] containing ti
+        lo, hi = 0, n - 1
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if t0[mid] <= ti:
+                lo = mid
+            else:
+                hi = mid
+        a = (ti - t0[lo]) / (t0[lo + 1] - t0[lo])
+
+        ax, ay, az, aw = q0[0, lo], q0[1, lo], q0[2, lo], q0[3, lo]
+        bx, by, bz, bw = q0[0, lo + 1], q0[1, lo + 1], q0[2, lo + 1], q0[3, lo + 1]
+        na = np.sqrt(ax * ax + ay * ay + az * az + aw * aw)
+        nb = np.sqrt(bx * bx + by * by + bz * bz + bw * bw)
+        dot = (ax * bx + ay * by + az * bz + aw * bw) / (na * nb)
+        sign = 1.0
+        if dot < 0.0:
+            dot = -dot
+            sign = -1.0
+        # Keyframes are dense, so only fall back to lerp where the slerp weights become
+        # ill-conditioned; the looser 0.9995 cutoff used by slerp() costs ~1e-7 here
+        if dot > 1.0 - 1.0e-10:
+            s0 = 1.0 - a
+            s1 = a
+        else:
+            theta = np.arccos(dot)
+            st = np.sin(theta)
+            s0 = np.sin((1.0 - a) * theta) / st
+            s1 = np.sin(a * theta) / st
+        s0 = s0 / na
+        s1 = sign * s1 / nb
+
+        px = s0 * ax + s1 * bx
+        py = s0 * ay + s1 * by
+        pz = s0 * az + s1 * bz
+        pw = s0 * aw + s1 * bw
+        m = np.sqrt(px * px + py * py + pz * pz + pw * pw)
+        out[0, i] = px / m
+        out[1, i] = py / m
+        out[2, i] = pz / m
+        out[3, i] = pw / m
+
+
+@njit(cache=True)
 def rotmatrix_to_quaternion(A: np.ndarray) -> np.ndarray:
     """
     Convert a rotation matrix to a quaternion.
     Source: Markley (Eq. 2.135, p.48)
     """
-    trA = np.trace(A)
-    A11 = A[0, 0]
-    A22 = A[1, 1]
-    A33 = A[2, 2]
-
-    if max(trA, A11, A22, A33) == trA:
-        q4 = np.sqrt(1 + trA) / 2
-        q1 = (A[2, 1] - A[1, 2]) / (4 * q4)
-        q2 = (A[0, 2] - A[2, 0]) / (4 * q4)
-        q3 = (A[1, 0] - A[0, 1]) / (4 * q4)
-    elif max(trA, A11, A22, A33) == A11:
-        q1 = np.sqrt(1 + 2 * A11 - trA) / 2
-        q2 = (A[0, 1] + A[1, 0]) / (4 * q1)
-        q3 = (A[0, 2] + A[2, 0]) / (4 * q1)
-        q4 = (A[1, 2] - A[2, 1]) / (4 * q1)
-    elif max(trA, A11, A22, A33) == A22:
-        q2 = np.sqrt(1 + 2 * A22 - trA) / 2
-        q1 = (A[0, 1] + A[1, 0]) / (4 * q2)
-        q3 = (A[1, 2] + A[2, 1]) / (4 * q2)
-        q4 = (A[0, 2] - A[2, 0]) / (4 * q2)
-    elif max(trA, A11, A22, A33) == A33:
-        q3 = np.sqrt(1 + 2 * A33 - trA) / 2
-        q1 = (A[0, 2] + A[2, 0]) / (4 * q3)
-        q2 = (A[1, 2] + A[2, 1]) / (4 * q3)
-        q4 = (A[0, 1] - A[1, 0]) / (4 * q3)
-
-    return np.array([q1, q2, q3, q4])
+    return _rotmat_to_quat(A)
 
 
+@njit(cache=True)
 def quat_to_rotmatrix(q: np.ndarray) -> np.ndarray:
     """Quaternion to rotation matrix
-    Markley (Eq. 2.129, p.46)"""
-    return quat_xi(q).T @ quat_psi(q)
+    Markley (Eq. 2.129, p.46), expanded from Xi(q)^T Psi(q)"""
+    return _quat_to_rotmatrix(q.ravel())
+
+
+@njit(cache=True)
+def quat_rotate_vec(q: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """Apply the attitude matrix of a unit quaternion to a vector, A(q) @ v.
+
+    Uses t = 2 q_vec x v, A(q) v = v - q4 t + q_vec x t, which avoids building A(q).
+
+    Args:
+        q: np.ndarray of shape (4,) or (4,1), unit norm
+        v: np.ndarray of shape (3,) or (3,1)
+
+    Output: np.ndarray of shape (3,)
+    """
+    q_flat = q.ravel()
+    v_flat = v.ravel()
+    qx, qy, qz, qw = q_flat[0], q_flat[1], q_flat[2], q_flat[3]
+    vx, vy, vz = v_flat[0], v_flat[1], v_flat[2]
+    tx = 2.0 * (qy * vz - qz * vy)
+    ty = 2.0 * (qz * vx - qx * vz)
+    tz = 2.0 * (qx * vy - qy * vx)
+    out = np.empty(3)
+    out[0] = vx - qw * tx + (qy * tz - qz * ty)
+    out[1] = vy - qw * ty + (qz * tx - qx * tz)
+    out[2] = vz - qw * tz + (qx * ty - qy * tx)
+    return out
 
 
 def rotmatrix_to_euler313(A: np.ndarray) -> np.ndarray:
@@ -240,7 +408,11 @@ def rotmatrix_to_euler313(A: np.ndarray) -> np.ndarray:
     phi = np.arctan2(sigma * A[2, 0], -sigma * A[2, 1])  # roll
     psi = np.arctan2(sigma * A[0, 2], sigma * A[1, 2])  # yaw
 
-    return np.array([phi, theta, psi])
+    out = np.empty(3)
+    out[0] = phi
+    out[1] = theta
+    out[2] = psi
+    return out
 
 
 def rotmatrix_to_euler321(A: np.ndarray) -> np.ndarray:
@@ -251,22 +423,131 @@ def rotmatrix_to_euler321(A: np.ndarray) -> np.ndarray:
     pitch = np.arcsin(-A[2, 0])
     yaw = np.arctan2(A[1, 0], A[0, 0])
     roll = np.arctan2(A[2, 1], A[2, 2])
-    return np.array([roll, pitch, yaw])
+    out = np.empty(3)
+    out[0] = roll
+    out[1] = pitch
+    out[2] = yaw
+    return out
 
 
 def quat_to_euler(q: np.ndarray) -> np.ndarray:
-    """Quaternion to Euler angles (ZYX sequence for roll, pitch, yaw)"""
-    # If q is a single quaternion (4,) or (4,1)
-    if q.ndim == 1 or (q.ndim == 2 and q.shape[1] == 1):
-        return rotmatrix_to_euler321(quat_to_rotmatrix(q))
-    
-    # If q is an array of quaternions (4, N)
-    num_quats = q.shape[1]
-    euler_angles = np.empty((3, num_quats))
-    for i in range(num_quats):
-        # Extract each quaternion
-        q_i = q[:, i].reshape(4, 1)
-        # Convert to Euler and store
-        euler_angles[:, i] = rotmatrix_to_euler321(quat_to_rotmatrix(q_i)).flatten()
-        
+    """Quaternion to Euler angles (ZYX sequence for roll, pitch, yaw)
+
+    Equivalent to rotmatrix_to_euler321(quat_to_rotmatrix(q)), but only the five
+    attitude matrix entries that are needed are evaluated, directly from the
+    quaternion components (Markley Eq. 2.129, p.46).
+
+    Args:
+        q: np.ndarray of shape (4,), (4,1) or (4,N)
+
+    Output: np.ndarray with [roll, pitch, yaw], of shape (3,) or (3,N)
+    """
+    single = q.ndim == 1 or (q.ndim == 2 and q.shape[1] == 1)
+    q = q.reshape(4, -1)
+    x, y, z, w = q[0], q[1], q[2], q[3]
+    ww, xx, yy, zz = w * w, x * x, y * y, z * z
+
+    # Clip so round-off on slightly unnormalized samples near +-90 deg pitch cannot produce NaN
+    pitch = np.arcsin(np.clip(-2 * (x * z + w * y), -1.0, 1.0))  # -A[2, 0]
+    yaw = np.arctan2(2 * (x * y - w * z), ww + xx - yy - zz)    # A[1, 0], A[0, 0]
+    roll = np.arctan2(2 * (y * z - w * x), ww - xx - yy + zz)   # A[2, 1], A[2, 2]
+
+    euler_angles = np.stack((roll, pitch, yaw))
+    if single:
+        return euler_angles[:, 0]
     return euler_angles
+
+
+@njit(fastmath=True, cache=True)
+def quat_to_euler_batch(Q: np.ndarray) -> np.ndarray:
+    """Compiled equivalent of quat_to_euler for a (4, N) array, one pass over the columns.
+
+    Serial on purpose: the API calls this from asyncio.to_thread workers, and numba's
+    parallel backends either deadlock (TBB) or abort (workqueue) when entered from
+    several threads.
+
+    Output: np.ndarray of shape (3, N) with [roll, pitch, yaw]
+    """
+    N = Q.shape[1]
+    out = np.empty((3, N))
+    for i in range(N):
+        x, y, z, w = Q[0, i], Q[1, i], Q[2, i], Q[3, i]
+        ww, xx, yy, zz = w * w, x * x, y * y, z * z
+        sinp = -2.0 * (x * z + w * y)
+        sinp = min(1.0, max(-1.0, sinp))
+        out[0, i] = np.arctan2(2.0 * (y * z - w * x), ww - xx - yy + zz)
+        out[1, i] = np.arcsin(sinp)
+        out[2, i] = np.arctan2(2.0 * (x * y - w * z), ww + xx - yy - zz)
+    return out
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _propagate_quats_kernel(q: np.ndarray, omega: np.ndarray, dt: float, out: np.ndarray) -> None:
+    """Propagate every column of q by its body rate over dt, writing into out.
+    Each column is independent, so the loop runs in parallel over prange."""
+    for i in prange(q.shape[1]):
+        qx, qy, qz, qw = q[0, i], q[1, i], q[2, i], q[3, i]
+        wx, wy, wz = omega[0, i], omega[1, i], omega[2, i]
+
+        # Rotation increment dq = [axis * sin(theta/2), cos(theta/2)]
+        w_norm = np.sqrt(wx * wx + wy * wy + wz * wz)
+        theta = w_norm * dt
+        if theta == 0.0:
+            dx, dy, dz, dw = 0.0, 0.0, 0.0, 1.0
+        else:
+            s2 = np.sin(theta / 2) / w_norm
+            dx, dy, dz, dw = wx * s2, wy * s2, wz * s2, np.cos(theta / 2)
+
+        # q ⊗ dq (Markley Eq. 2.85, p.38)
+        px = qw * dx + qz * dy - qy * dz + qx * dw
+        py = -qz * dx + qw * dy + qx * dz + qy * dw
+        pz = qy * dx - qx * dy + qw * dz + qz * dw
+        pw = -qx * dx - qy * dy - qz * dz + qw * dw
+
+        n = np.sqrt(px * px + py * py + pz * pz + pw * pw)
+        out[0, i] = px / n
+        out[1, i] = py / n
+        out[2, i] = pz / n
+        out[3, i] = pw / n
+
+
+def propagate_quats(q: np.ndarray, omega: np.ndarray, dt: float, out: np.ndarray = None) -> np.ndarray:
+    """Propagate many attitude quaternions by one step of constant body rate.
+
+    Batched equivalent of dynamics.integrate_attitude_quat_mult, applied to
+    each column independently.
+
+    Args:
+        q: (4, N) quaternions with scalar-last convention [x, y, z, w]
+        omega: (3, N) body angular velocities [rad/s]
+        dt: time step [s]
+        out: optional (4, N) output buffer; may be q itself to update in place
+
+    Returns:
+        (4, N) array of propagated, normalized quaternions
+    """
+    q = np.ascontiguousarray(q, dtype=np.float64)
+    omega = np.ascontiguousarray(omega, dtype=np.float64)
+    if out is None:
+        out = np.empty_like(q)
+    _propagate_quats_kernel(q, omega, float(dt), out)
+    return out
+
+
+def _warmup() -> None:
+    """Compile the hot kernels at import so the first request does not pay for JIT.
+    With cache=True later processes load the compiled code from __pycache__ instead."""
+    q = np.array([0.0, 0.0, 0.0, 1.0])
+    v = np.array([1.0, 0.0, 0.0])
+    quat_psi(q)
+    quat_xi(q)
+    quat_multiply_cross(q, q)
+    quat_multiply_cross(q, v)
+    quat_multiply_dot(q, q)
+    quat_multiply_dot(q, v)
+    quat_normalize(q)
+    quat_conj(q)
+    quat_inv(q)
+
+
+_warmup()
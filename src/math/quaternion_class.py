@@ -2,13 +2,18 @@ import numpy as np
 from scipy.spatial.transform import Rotation as R 
 from scipy.spatial.transform import Slerp 
 
+from .quaternion import quat_multiply_cross_into, _IDENTITY_Q
+
 class Quaternion:
     """A quaternion class for attitude representation and operations.
 
-    The quaternion is stored as a 4x1 numpy array with scalar-last convention:
-    [q1, q2, q3, q4].T where q4 is the scalar component.
+    The quaternion is stored as a flat (4,) numpy array with scalar-last convention:
+    [q1, q2, q3, q4] where q4 is the scalar component.
+    The norm is computed lazily and cached until the quaternion is modified.
     """
 
+    __slots__ = ("_q", "_norm")
+
     def __init__(self, *args):
         """Initialize a quaternion from its 4 components.
 
@@ -28,30 +33,57 @@ class Quaternion:
         if len(args) == 4:
             # Four individual components
             q1, q2, q3, q4 = args
-            self._q = np.array([q1, q2, q3, q4], dtype=float).reshape(4, 1)
+            self._q = np.array([q1, q2, q3, q4], dtype=float)
         elif len(args) == 1:
             # Single array-like input
             value = args[0]
             if isinstance(value, (list, tuple)) and len(value) == 4:
                 # Convert 4-element list/tuple to numpy array
-                self._q = np.array(value, dtype=float).reshape(4, 1)
+                self._q = np.array(value, dtype=float)
             elif isinstance(value, np.ndarray):
                 # Handle numpy arrays
-                if value.shape == (4,):
-                    self._q = value.reshape(4, 1)
-                elif value.shape == (4, 1):
-                    self._q = value.copy()
+                if value.shape == (4,) or value.shape == (4, 1):
+                    self._q = value.astype(float).reshape(4)
                 else:
                     raise ValueError("Quaternion must be a 4x1 or (4,) numpy array")
             else:
                 raise ValueError("Single argument must be a 4-element array-like object")
         else:
             raise ValueError("Quaternion requires either 4 individual components or 1 array-like argument")
+        self._norm = None
+
+    @classmethod
+    def from_components(cls, q1: float, q2: float, q3: float, q4: float) -> 'Quaternion':
+        """Build a quaternion from its 4 components (scalar last)."""
+        q = np.empty(4)
+        q[0] = q1
+        q[1] = q2
+        q[2] = q3
+        q[3] = q4
+        return cls._from_raw(q)
+
+    @classmethod
+    def from_array(cls, value) -> 'Quaternion':
+        """Build a quaternion from any 4-element array-like (copied)."""
+        return cls._from_raw(np.array(value, dtype=np.float64).reshape(4))
+
+    @classmethod
+    def identity(cls) -> 'Quaternion':
+        """The identity quaternion [0, 0, 0, 1]."""
+        return cls._from_raw(_IDENTITY_Q.copy())
+
+    @classmethod
+    def _from_raw(cls, q: np.ndarray) -> 'Quaternion':
+        """Wrap a freshly computed (4,) array without validating or copying it."""
+        obj = cls.__new__(cls)
+        obj._q = q
+        obj._norm = None
+        return obj
 
     @property
     def q(self) -> np.ndarray:
         """Get the quaternion vector."""
-        return self._q.flatten()
+        return self._q.copy()
 
     @q.setter
     def q(self, value):
@@ -66,19 +98,18 @@ class Quaternion:
         # Handle different input formats
         if isinstance(value, (list, tuple)) and len(value) == 4:
             # Convert 4 individual values to numpy array
-            q_array = np.array(value, dtype=float).reshape(4, 1)
+            q_array = np.array(value, dtype=float)
         elif isinstance(value, np.ndarray):
             # Handle numpy arrays
-            if value.shape == (4,):
-                q_array = value.reshape(4, 1)
-            elif value.shape == (4, 1):
-                q_array = value
+            if value.shape == (4,) or value.shape == (4, 1):
+                q_array = value.astype(float).reshape(4)
             else:
                 raise ValueError("Quaternion must be a 4x1 or (4,) numpy array")
         else:
             raise ValueError("Quaternion must be a 4-element array-like object or numpy array")
 
-        self._q = q_array.copy()
+        self._q = q_array
+        self._norm = None
 
     @property
     def Psi(self) -> np.ndarray:
@@ -86,13 +117,13 @@ class Quaternion:
 
         Output: np.ndarray of shape (4,3)
         Source: Markley (Eq. 2.87, p.38)"""
-        q_flat = self._q.flatten()
-        return np.array([
-            [q_flat[3], q_flat[2], -q_flat[1]],
-            [-q_flat[2], q_flat[3], q_flat[0]],
-            [q_flat[1], -q_flat[0], q_flat[3]],
-            [-q_flat[0], -q_flat[1], -q_flat[2]]
-        ])
+        q0, q1, q2, q3 = self._q
+        M = np.empty((4, 3))
+        M[0, 0] = q3; M[0, 1] = q2; M[0, 2] = -q1
+        M[1, 0] = -q2; M[1, 1] = q3; M[1, 2] = q0
+        M[2, 0] = q1; M[2, 1] = -q0; M[2, 2] = q3
+        M[3, 0] = -q0; M[3, 1] = -q1; M[3, 2] = -q2
+        return M
 
     @property
     def Xi(self) -> np.ndarray:
@@ -100,13 +131,13 @@ class Quaternion:
 
         Output: np.ndarray of shape (4,3)
         Source: Markley (Eq. 2.88, p.38)"""
-        q_flat = self._q.flatten()
-        return np.array([
-            [q_flat[3], -q_flat[2], q_flat[1]],
-            [q_flat[2], q_flat[3], -q_flat[0]],
-            [-q_flat[1], q_flat[0], q_flat[3]],
-            [-q_flat[0], -q_flat[1], -q_flat[2]]
-        ])
+        q0, q1, q2, q3 = self._q
+        M = np.empty((4, 3))
+        M[0, 0] = q3; M[0, 1] = -q2; M[0, 2] = q1
+        M[1, 0] = q2; M[1, 1] = q3; M[1, 2] = -q0
+        M[2, 0] = -q1; M[2, 1] = q0; M[2, 2] = q3
+        M[3, 0] = -q0; M[3, 1] = -q1; M[3, 2] = -q2
+        return M
 
     @property
     def x(self) -> np.ndarray:
@@ -115,7 +146,13 @@ class Quaternion:
         Output: np.ndarray of shape (4,4)
         Usage in the context of quaternion multiplication: q1.x() @ q2.q
         Source: Markley (Eq. 2.85, p.38)"""
-        return np.hstack((self.Psi, self._q))
+        q0, q1, q2, q3 = self._q
+        M = np.empty((4, 4))
+        M[0] = (q3, q2, -q1, q0)
+        M[1] = (-q2, q3, q0, q1)
+        M[2] = (q1, -q0, q3, q2)
+        M[3] = (-q0, -q1, -q2, q3)
+        return M
 
     @property
     def ddot(self) -> np.ndarray:
@@ -124,7 +161,26 @@ class Quaternion:
         Output: np.ndarray of shape (4,4)
         Usage in the context of quaternion multiplication: q1.ddot() @ q2.q
         Source: Markley (Eq. 2.86, p.38)"""
-        return np.hstack((self.Xi, self._q))
+        q0, q1, q2, q3 = self._q
+        M = np.empty((4, 4))
+        M[0] = (q3, -q2, q1, q0)
+        M[1] = (q2, q3, -q0, q1)
+        M[2] = (-q1, q0, q3, q2)
+        M[3] = (-q0, -q1, -q2, q3)
+        return M
+
+    def _mul_vector(self, v: np.ndarray, sign: float) -> 'Quaternion':
+        """Product with a pure-vector quaternion [v; 0], without the 4x4 matrix.
+
+        q ⊗ [v; 0] = [q4*v - q_vec x v; -q_vec . v]  (sign = -1, Psi(q) @ v)
+        q ⨀ [v; 0] = [q4*v + q_vec x v; -q_vec . v]  (sign = +1, Xi(q) @ v)"""
+        q = self._q
+        axis = q[:3]
+        v = v.reshape(3)
+        out = np.empty(4)
+        out[:3] = q[3] * v + sign * np.cross(axis, v)
+        out[3] = -np.dot(axis, v)
+        return Quaternion._from_raw(out)
 
     @property
     def n(self) -> 'Quaternion':
@@ -133,26 +189,26 @@ class Quaternion:
         Returns:
             A new normalized Quaternion instance (original remains unchanged)
         """
-        n = np.linalg.norm(self._q)
+        n = self.norm
         if n == 0:
-            # Return identity quaternion
-            normalized_q = np.array([[0.0, 0.0, 0.0, 1.0]]).T
-        else:
-            normalized_q = self._q / n
-        return Quaternion(normalized_q)
+            return Quaternion.identity()
+        return Quaternion._from_raw(self._q / n)
 
     def normalize_inplace(self) -> None:
         """Normalize the quaternion in-place."""
-        n = np.linalg.norm(self._q)
+        n = self.norm
         if n == 0:
-            self._q = np.array([[0.0, 0.0, 0.0, 1.0]]).T
+            self._q = _IDENTITY_Q.copy()
         else:
             self._q = self._q / n
+        self._norm = None
 
     @property
     def norm(self) -> float:
         """Get the norm (magnitude) of the quaternion."""
-        return np.linalg.norm(self._q)
+        if self._norm is None:
+            self._norm = np.linalg.norm(self._q)
+        return self._norm
 
     @property
     def is_normalized(self) -> bool:
@@ -161,34 +217,35 @@ class Quaternion:
 
     @property 
     def conj(self) -> 'Quaternion':
-        return Quaternion(-self._q[0], -self._q[1], -self._q[2], self._q[3])
+        q_conj = -self._q
+        q_conj[3] = self._q[3]
+        return Quaternion._from_raw(q_conj)
 
     def __repr__(self) -> str:
         """Detailed string representation."""
-        return f"Quaternion(q={self._q.flatten()}, norm={self.norm:.6f})"
+        return f"Quaternion(q={self._q}, norm={self.norm:.6f})"
 
     def __add__(self, other: 'Quaternion') -> 'Quaternion':
-        return Quaternion(self._q + other._q)
+        return Quaternion._from_raw(self._q + other._q)
 
     def __sub__(self, other: 'Quaternion') -> 'Quaternion':
-        return Quaternion(self._q - other._q)
+        return Quaternion._from_raw(self._q - other._q)
     
     def __mul__(self, other):
         """Quaternion multiplication, defined as ⊗ operator from Markley.
         If the second argument is a vector, it is treated as a quaternion with a zero scalar component."""
         if isinstance(other, Quaternion):
-            return Quaternion(self.x @ other._q)
+            out = np.empty(4)
+            quat_multiply_cross_into(self._q, other._q, out)
+            return Quaternion._from_raw(out)
         elif isinstance(other, np.ndarray):
             # Handle 3x1 or (3,) vector
             if other.shape == (3,) or other.shape == (3,1):
-                # Make it a 4x1 array with 4th element zero
-                v4 = np.zeros((4,1))
-                v4[:3,0] = other.flatten()
-                return Quaternion(self.x @ v4)
+                return self._mul_vector(other, -1.0)
             else:
                 raise ValueError("Can only multiply Quaternion by a 3-element vector")
         elif np.isscalar(other):
-            return Quaternion(self._q * other)
+            return Quaternion._from_raw(self._q * other)
         else:
             return NotImplemented
 
@@ -196,18 +253,18 @@ class Quaternion:
         """Quaternion multiplication, defined as ⊙ operator from Markley.
         If the second argument is a vector, it is treated as a quaternion with a zero scalar component."""
         if isinstance(other, Quaternion):
-            return Quaternion(self.ddot @ other._q)
+            # q1 ⨀ q2 = q2 ⊗ q1
+            out = np.empty(4)
+            quat_multiply_cross_into(other._q, self._q, out)
+            return Quaternion._from_raw(out)
         elif isinstance(other, np.ndarray):
             # Handle 3x1 or (3,) vector
             if other.shape == (3,) or other.shape == (3,1):
-                # Make it a 4x1 array with 4th element zero
-                v4 = np.zeros((4,1))
-                v4[:3,0] = other.flatten()
-                return Quaternion(self.ddot @ v4)
+                return self._mul_vector(other, 1.0)
             else:
                 raise ValueError("Can only multiply Quaternion by a 3-element vector")
         elif np.isscalar(other):
-            return Quaternion(self._q * other)
+            return Quaternion._from_raw(self._q * other)
         else:
             return NotImplemented
 
@@ -215,22 +272,26 @@ class Quaternion:
         return self.conj / self.norm**2
     
     def __truediv__(self, other: float) -> 'Quaternion': # scalar division
-        return Quaternion(self._q / other)
+        return Quaternion._from_raw(self._q / other)
 
     def __rmul__(self, other) -> 'Quaternion': # scalar multiplication
         if isinstance(other, np.ndarray):   # Handle 3x1 or (3,) vector
-            if other.shape == (3,) or other.shape == (3,1):  # Make it a 4x1 array with 4th element zero              
-                v4 = np.zeros((4,1))
-                v4[:3,0] = other.flatten()
-                return Quaternion(self.x @ v4)
+            if other.shape == (3,) or other.shape == (3,1):
+                return self._mul_vector(other, -1.0)
             else:
                 raise ValueError("Can only multiply Quaternion by a 3-element vector")
         elif np.isscalar(other):
-            return Quaternion(self._q * other)
+            return Quaternion._from_raw(self._q * other)
         else:
             return NotImplemented
     
     def __eq__(self, other: 'Quaternion') -> bool:
-        return np.allclose(self._q, other._q)
+        if not isinstance(other, Quaternion):
+            return NotImplemented
+        # np.allclose semantics (rtol=1e-5, atol=1e-8), written out for (4,) operands
+        return bool(np.all(np.abs(self._q - other._q) <= 1e-8 + 1e-5 * np.abs(other._q)))
+
+    # Equality is tolerance-based, so quaternions are not hashable
+    __hash__ = None
     
 
@@ -2,14 +2,24 @@ from __future__ import annotations
 
 import json
 import socket
+from functools import lru_cache
 from typing import Optional
 
+import orjson
 from jsonschema import Draft202012Validator
 
+try:
+    # msgspec parses JSON straight from bytes, several times faster than json.loads
+    from msgspec.json import decode as _json_decode  # type: ignore
+except Exception:
+    _json_decode = orjson.loads
+
 
 # Not currently used! Perhaps in the future we will use for 
 # software-in-the-loop simulation (the initial idea of the project)
 
+# Parsed once per path; callers share the returned dict and must not mutate it
+@lru_cache(maxsize=4)
 def load_protocol_schemas(schema_path: str) -> dict:
     with open(schema_path, "r", encoding="utf-8") as f:
         return json.load(f)
@@ -30,8 +40,8 @@ class NDJSONUDPSocket:
         self.sock_recv.settimeout(max(0.0, recv_timeout))
 
     def send_json(self, obj: dict): # send a json object to the flight software
-        line = json.dumps(obj, separators=(",", ":")) + "\n"
-        self.sock_send.sendto(line.encode("utf-8"), self.send_addr)
+        # orjson emits compact UTF-8 bytes directly, so no separate encode step is needed
+        self.sock_send.sendto(orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE), self.send_addr)
 
     def try_recv_json(self) -> Optional[dict]: # try to receive a json object from the flight software; Optional as it may not receive anything
         try:
@@ -40,22 +50,34 @@ class NDJSONUDPSocket:
             return None
         except BlockingIOError:
             return None
-        line = data.decode("utf-8").strip()
-        if not line:
-            return None
+        # Both decoders accept the raw datagram bytes (including the trailing newline) and
+        # raise a ValueError subclass on empty, truncated or non-UTF-8 input
         try:
-            return json.loads(line)
-        except json.JSONDecodeError:
+            return _json_decode(data)
+        except ValueError:
             return None
 
 
+# Compiled validators keyed by id() of the schemas dict. The dict itself is kept in the
+# entry so its id cannot be reused by another object while the entry is alive.
+_VALIDATOR_CACHE: dict[int, tuple[dict, dict]] = {}
+
+
+def _build_validators(schemas: dict) -> dict:
+    entry = _VALIDATOR_CACHE.get(id(schemas))
+    if entry is None or entry[0] is not schemas:
+        entry = (schemas, {
+            "gyro-v1": Draft202012Validator(schemas["sensor-gyro-v1"]),
+            "gps-v1": Draft202012Validator(schemas["sensor-gps-v1"]),
+        })
+        _VALIDATOR_CACHE[id(schemas)] = entry
+    return entry[1]
+
+
 class SchemaRegistry:
     def __init__(self, schemas: dict):
         self.schemas = schemas
-        self.validators = {
-            "gyro-v1": Draft202012Validator(self.schemas["sensor-gyro-v1"]),
-            "gps-v1": Draft202012Validator(self.schemas["sensor-gps-v1"]),
-        }
+        self.validators = _build_validators(schemas)
 
     def validate_sensor(self, msg: dict) -> None:
         schema_version = msg.get("schema_version", "")
@@ -22,50 +22,88 @@ MU_EARTH = 3.986004418e14  # [m^s^2]
 
 mu = MU_EARTH
 
-@njit
+# Layout of the plant state vector y = [r(3), v(3), w(3), q(4), h(3)]
+R_SL = slice(0, 3)    # position in ECI [m]
+V_SL = slice(3, 6)    # velocity in ECI [m/s]
+W_SL = slice(6, 9)    # body angular velocity [rad/s]
+Q_SL = slice(9, 13)   # attitude quaternion, scalar last
+H_SL = slice(13, 16)  # reaction wheel angular momentum [N m s]
+STATE_SIZE = 16
+
+# Levi-Civita tensor, used to build batches of skew-symmetric matrices
+_EPS = np.zeros((3, 3, 3))
+_EPS[0, 1, 2] = _EPS[1, 2, 0] = _EPS[2, 0, 1] = 1.0
+_EPS[0, 2, 1] = _EPS[2, 1, 0] = _EPS[1, 0, 2] = -1.0
+
+@njit(cache=True)
 def skew(v: np.ndarray) -> np.ndarray:
     """Return the 3x3 skew-symmetric matrix (v_x) of a 3-element vector v."""
-    return np.array([
-        [0.0, -v[2],  v[1]],
-        [v[2],  0.0, -v[0]],
-        [-v[1], v[0],  0.0]
-    ])
-
-@njit
-def state_deriv(t: float, y: np.ndarray, J: np.ndarray, Ji: np.ndarray,
+    S = np.zeros((3, 3))
+    S[0, 1] = -v[2]
+    S[0, 2] = v[1]
+    S[1, 0] = v[2]
+    S[1, 2] = -v[0]
+    S[2, 0] = -v[1]
+    S[2, 1] = v[0]
+    return S
+
+def skew_batch(V: np.ndarray) -> np.ndarray:
+    """Return the skew-symmetric matrices of a batch of 3-element vectors.
+    Inputs:
+        V: np.ndarray of shape (..., 3)
+    Output:
+        np.ndarray of shape (..., 3, 3), with [v_x]_ij = -eps_ijk v_k
+    """
+    return np.einsum('ijk,...k->...ji', _EPS, V)
+
+@njit(cache=True, fastmath=True)
+def state_deriv(t: float, y: np.ndarray, J_diag: np.ndarray, Ji_diag: np.ndarray,
     control_type: int, kp: float, kd: float, qc: np.ndarray) -> np.ndarray:
     """
     Compute the derivative of the state vector.
     Inputs:
-        y: np.ndarray of shape (6,) - state vector
-        mu: float - gravitational parameter
+        y: np.ndarray of shape (16,) - state vector, laid out as R_SL, V_SL, W_SL, Q_SL, H_SL
+        J_diag, Ji_diag: (3,) principal moments of inertia and their reciprocals
     Output:
+        np.ndarray of shape (16,) - dy/dt in the same layout
     """
-
-    r = y[0:3]
-    v = y[3:6]
-    w = y[6:9]
-    q = y[9:13]
-    # Wheel angular momentum vector h (aligned with principal axes)
-    h = y[13:16]
-    # Ensure matrix dtypes are float64 for stable Numba matmul
-    Jf = J.astype(np.float64)
-    Jif = Ji.astype(np.float64)
-    q = qm.quat_normalize(q)
-
+    q = qm.quat_normalize(y[Q_SL])
+    w = y[W_SL]
     L = control_laws(w, q, qc, control_type, kp, kd)
 
-    drdt = v
-    dvdt = -mu * r / np.linalg.norm(r) ** 3
-    dqdt = 0.5 * qm.quat_multiply_dot(q, w)
-    dwdt = Jif @ (L - (skew(w) @ Jf) @ w)
-    # Reaction wheel momentum dynamics in body frame
-    dhdt = -skew(w) @ h - L
-
-    dydt = np.hstack((drdt, dvdt, dwdt, dqdt, dhdt))
-    return dydt
-
-@njit
+    rx, ry, rz = y[0], y[1], y[2]
+    wx, wy, wz = y[6], y[7], y[8]
+    qx, qy, qz, qw = q[0], q[1], q[2], q[3]
+    # Wheel angular momentum vector h (aligned with principal axes)
+    hx, hy, hz = y[13], y[14], y[15]
+
+    dy = np.empty(16)
+    dy[0:3] = y[3:6]
+    r2 = rx * rx + ry * ry + rz * rz
+    k = -mu / (r2 * np.sqrt(r2))
+    dy[3] = k * rx
+    dy[4] = k * ry
+    dy[5] = k * rz
+
+    # Euler's equations in principal axes: J is diagonal, so J w and J^-1 x are elementwise
+    ax, ay, az = J_diag[0] * wx, J_diag[1] * wy, J_diag[2] * wz
+    dy[6] = Ji_diag[0] * (L[0] - (wy * az - wz * ay))
+    dy[7] = Ji_diag[1] * (L[1] - (wz * ax - wx * az))
+    dy[8] = Ji_diag[2] * (L[2] - (wx * ay - wy * ax))
+
+    # Kinematics dq/dt = 0.5 q (.) [w; 0] (Markley Eq. 3.20), expanded
+    dy[9] = 0.5 * (wx * qw + wz * qy - wy * qz)
+    dy[10] = 0.5 * (wy * qw + wx * qz - wz * qx)
+    dy[11] = 0.5 * (wz * qw + wy * qx - wx * qy)
+    dy[12] = -0.5 * (wx * qx + wy * qy + wz * qz)
+
+    # Reaction wheel momentum dynamics in body frame: dh/dt = -w x h - L
+    dy[13] = -(wy * hz - wz * hy) - L[0]
+    dy[14] = -(wz * hx - wx * hz) - L[1]
+    dy[15] = -(wx * hy - wy * hx) - L[2]
+    return dy
+
+@njit(cache=True)
 def control_laws(w: np.ndarray, q: np.ndarray, qc: np.ndarray, control_type: int, kp: float, kd: float):
     if control_type == 0:
         return np.zeros(3)
@@ -76,14 +114,14 @@ def control_laws(w: np.ndarray, q: np.ndarray, qc: np.ndarray, control_type: int
     # Fallback to safe default if control_type is unknown
     return np.zeros(3)
 
-@njit
+@njit(cache=True)
 def control_law_tracking(w: np.ndarray, q: np.ndarray, qc: np.ndarray, kp: float, kd: float):
     dq = qm.quat_multiply_cross(q, qm.quat_inv(qc))
     dq = qm.quat_normalize(dq)
     L = - kp * np.sign(dq[3]) * dq[0:3] - kd * w
     return L
 
-@njit
+@njit(cache=True)
 def control_law_nonlinear_tracking(w: np.ndarray, q: np.ndarray, qc: np.ndarray, kp: float, kd: float):
     dq = qm.quat_multiply_cross(q, qm.quat_inv(qc))
     dq = qm.quat_normalize(dq)
@@ -101,7 +139,7 @@ def control_law_nonlinear_tracking(w: np.ndarray, q: np.ndarray, qc: np.ndarray,
 
 #### Old
 
-@njit
+@njit(cache=True)
 def two_body_acceleration(r_eci: np.ndarray, mu: float = MU_EARTH) -> np.ndarray:
     r_norm = np.linalg.norm(r_eci)
     if r_norm == 0:
@@ -139,8 +177,55 @@ def rk4_step_orbit(r_eci: np.ndarray, v_eci: np.ndarray, dt: float, mu: float =
     a_next = two_body_acceleration(r_next, mu)
     return r_next, v_next, a_next
 
+@njit(cache=True)
+def _two_body_scalar(rx: float, ry: float, rz: float, mu: float) -> tuple:
+    """Two-body acceleration -mu r / |r|^3 on scalar components."""
+    r2 = rx * rx + ry * ry + rz * rz
+    k = -mu / (r2 * np.sqrt(r2))
+    return k * rx, k * ry, k * rz
 
-@njit
+@njit(cache=True)
+def rk4_roll_orbit(r0: np.ndarray, v0: np.ndarray, dt: float, n: int, mu: float = MU_EARTH) -> tuple:
+    """
+    n successive rk4_step_orbit steps under two-body gravity.
+    Position and velocity are carried as six scalars through the loop, so no array
+    is allocated per stage or per step.
+    Inputs:
+        r0: np.ndarray of shape (3,) - initial position in ECI frame
+        v0: np.ndarray of shape (3,) - initial velocity in ECI frame
+        dt: float - time step
+        n: int - number of steps
+        mu: float - gravitational parameter
+    Output:
+        tuple of (r_n, v_n) - position and velocity after n steps
+    """
+    rx, ry, rz = r0[0], r0[1], r0[2]
+    vx, vy, vz = v0[0], v0[1], v0[2]
+    h = 0.5 * dt
+    c = dt / 6.0
+    for _ in range(n):
+        # Stage k_i = (v_i, a(r_i)); the position slope of each stage is the stage velocity
+        a1x, a1y, a1z = _two_body_scalar(rx, ry, rz, mu)
+        v2x, v2y, v2z = vx + h * a1x, vy + h * a1y, vz + h * a1z
+        a2x, a2y, a2z = _two_body_scalar(rx + h * vx, ry + h * vy, rz + h * vz, mu)
+        v3x, v3y, v3z = vx + h * a2x, vy + h * a2y, vz + h * a2z
+        a3x, a3y, a3z = _two_body_scalar(rx + h * v2x, ry + h * v2y, rz + h * v2z, mu)
+        v4x, v4y, v4z = vx + dt * a3x, vy + dt * a3y, vz + dt * a3z
+        a4x, a4y, a4z = _two_body_scalar(rx + dt * v3x, ry + dt * v3y, rz + dt * v3z, mu)
+        rx += c * (vx + 2.0 * v2x + 2.0 * v3x + v4x)
+        ry += c * (vy + 2.0 * v2y + 2.0 * v3y + v4y)
+        rz += c * (vz + 2.0 * v2z + 2.0 * v3z + v4z)
+        vx += c * (a1x + 2.0 * a2x + 2.0 * a3x + a4x)
+        vy += c * (a1y + 2.0 * a2y + 2.0 * a3y + a4y)
+        vz += c * (a1z + 2.0 * a2z + 2.0 * a3z + a4z)
+    r = np.empty(3)
+    v = np.empty(3)
+    r[0], r[1], r[2] = rx, ry, rz
+    v[0], v[1], v[2] = vx, vy, vz
+    return r, v
+
+
+@njit(cache=True)
 def omega_to_quat_derivative(q: np.ndarray, w: np.ndarray) -> np.ndarray:
     """Convert angular velocity to quaternion derivative.
     Inputs:
@@ -176,6 +261,54 @@ def integrate_attitude_rk4(q_bi: np.ndarray, omega_b: np.ndarray, dt: float) ->
     q_next = q_bi + (dt / 6.0) * (k1 + 2 * k2 + 2 * k3 + k4)
     return qm.quat_normalize(q_next)
 
+@njit(cache=True)
+def _quat_kinematics(qx: float, qy: float, qz: float, qw: float,
+    wx: float, wy: float, wz: float) -> tuple[float, float, float, float]:
+    """dq/dt = 0.5 q (.) [w; 0] (Markley Eq. 3.20, p.71) on scalar components."""
+    return (0.5 * (wx * qw + wz * qy - wy * qz),
+            0.5 * (wy * qw + wx * qz - wz * qx),
+            0.5 * (wz * qw + wy * qx - wx * qy),
+            -0.5 * (wx * qx + wy * qy + wz * qz))
+
+@njit(cache=True)
+def rk4_roll_attitude(q0: np.ndarray, omega_b: np.ndarray, dt: float, n: int) -> np.ndarray:
+    """
+    n successive integrate_attitude_rk4 steps at a constant body rate.
+    The quaternion is carried as four scalars through the loop, so no array is
+    allocated per stage or per step.
+    Inputs:
+        q0: np.ndarray of shape (4,) - initial attitude, scalar last
+        omega_b: np.ndarray of shape (3,) - body angular velocity
+        dt: float - time step
+        n: int - number of steps
+    Output:
+        q_n: np.ndarray of shape (4,) - attitude after n steps (normalized)
+    """
+    qx, qy, qz, qw = q0[0], q0[1], q0[2], q0[3]
+    wx, wy, wz = omega_b[0], omega_b[1], omega_b[2]
+    h = 0.5 * dt
+    for _ in range(n):
+        k1x, k1y, k1z, k1w = _quat_kinematics(qx, qy, qz, qw, wx, wy, wz)
+        k2x, k2y, k2z, k2w = _quat_kinematics(qx + h * k1x, qy + h * k1y, qz + h * k1z, qw + h * k1w, wx, wy, wz)
+        k3x, k3y, k3z, k3w = _quat_kinematics(qx + h * k2x, qy + h * k2y, qz + h * k2z, qw + h * k2w, wx, wy, wz)
+        k4x, k4y, k4z, k4w = _quat_kinematics(qx + dt * k3x, qy + dt * k3y, qz + dt * k3z, qw + dt * k3w, wx, wy, wz)
+        c = dt / 6.0
+        qx += c * (k1x + 2.0 * k2x + 2.0 * k3x + k4x)
+        qy += c * (k1y + 2.0 * k2y + 2.0 * k3y + k4y)
+        qz += c * (k1z + 2.0 * k2z + 2.0 * k3z + k4z)
+        qw += c * (k1w + 2.0 * k2w + 2.0 * k3w + k4w)
+        inv = 1.0 / np.sqrt(qx * qx + qy * qy + qz * qz + qw * qw)
+        qx *= inv
+        qy *= inv
+        qz *= inv
+        qw *= inv
+    out = np.empty(4)
+    out[0] = qx
+    out[1] = qy
+    out[2] = qz
+    out[3] = qw
+    return out
+
 def integrate_attitude_quat_mult(q_bi: np.ndarray, omega_b: np.ndarray, dt: float) -> np.ndarray:
     """
     Integrate attitude using quaternion multiplication.
@@ -195,14 +328,16 @@ def integrate_attitude_quat_mult(q_bi: np.ndarray, omega_b: np.ndarray, dt: floa
     axis = omega_b / np.linalg.norm(omega_b)
     s2 = np.sin(theta / 2)
     c2 = np.cos(theta / 2)
-    dq = np.array([axis[0] * s2, axis[1] * s2, axis[2] * s2, c2])
+    dq = np.empty(4)
+    dq[:3] = axis * s2
+    dq[3] = c2
     q_next = qm.quat_multiply_cross(q_bi, dq)
     return qm.quat_normalize(q_next)
     
 
 
 
-@njit
+@njit(cache=True)
 def eulers_equations(w: np.ndarray, J: np.ndarray, L: np.ndarray) -> np.ndarray:
     """
     Euler's equations for the rigid body dynamics. 
@@ -213,9 +348,27 @@ def eulers_equations(w: np.ndarray, J: np.ndarray, L: np.ndarray) -> np.ndarray:
     Output:
         dw/dt: np.ndarray of shape (3,) - angular acceleration
     """
-    return inv(J) @ (L - skew(w) @ J @ w)
+    return _eulers_equations_ji(w, J, inv(J), L)
+
+@njit(cache=True)
+def _eulers_equations_ji(w: np.ndarray, J: np.ndarray, Ji: np.ndarray, L: np.ndarray) -> np.ndarray:
+    """Euler's equations with a precomputed inverse inertia Ji, written out in scalars."""
+    wx, wy, wz = w[0], w[1], w[2]
+    ax = J[0, 0] * wx + J[0, 1] * wy + J[0, 2] * wz
+    ay = J[1, 0] * wx + J[1, 1] * wy + J[1, 2] * wz
+    az = J[2, 0] * wx + J[2, 1] * wy + J[2, 2] * wz
+    # L - w x (J w)
+    bx = L[0] - (wy * az - wz * ay)
+    by = L[1] - (wz * ax - wx * az)
+    bz = L[2] - (wx * ay - wy * ax)
+    dw = np.empty(3)
+    dw[0] = Ji[0, 0] * bx + Ji[0, 1] * by + Ji[0, 2] * bz
+    dw[1] = Ji[1, 0] * bx + Ji[1, 1] * by + Ji[1, 2] * bz
+    dw[2] = Ji[2, 0] * bx + Ji[2, 1] * by + Ji[2, 2] * bz
+    return dw
 
 # To do: integrate with sympletic 
+@njit(cache=True)
 def integrate_ang_vel_rk4(w: np.ndarray, J: np.ndarray, L: np.ndarray, dt: float) -> np.ndarray:
     """
     Integrate angular velocity using RK4.
@@ -228,8 +381,10 @@ def integrate_ang_vel_rk4(w: np.ndarray, J: np.ndarray, L: np.ndarray, dt: float
     Output:
         w_next: np.ndarray of shape (3,) - next angular velocity 
     """
+    Ji = inv(J)
+
     def f(w: np.ndarray) -> np.ndarray:
-        return eulers_equations(w, J, L)
+        return _eulers_equations_ji(w, J, Ji, L)
 
     k1 = f(w)
     k2 = f(w + 0.5 * dt * k1)
@@ -239,6 +394,7 @@ def integrate_ang_vel_rk4(w: np.ndarray, J: np.ndarray, L: np.ndarray, dt: float
     w_next = w + (dt / 6.0) * (k1 + 2 * k2 + 2 * k3 + k4)
     return w_next
 
+@njit(cache=True)
 def integrate_ang_vel_symplectic(w: np.ndarray, J: np.ndarray, L: np.ndarray, dt: float) -> np.ndarray:
     """
     Integrate angular velocity using Strang splitting.
@@ -262,7 +418,8 @@ def integrate_ang_vel_symplectic(w: np.ndarray, J: np.ndarray, L: np.ndarray, dt
     w_0 = w.copy()
     h_0 = J @ w_0
     
-    A = dt / 2 * skew(inv(J) @ h_0)
+    # Torque-free body-frame momentum obeys dh/dt = -w x h, hence the minus sign
+    A = -dt / 2 * skew(inv(J) @ h_0)
     Q = solve(np.eye(3) - A, np.eye(3) + A)
 
     h_1 = h_0 + 0.5 * dt * L # First half kick
@@ -272,6 +429,33 @@ def integrate_ang_vel_symplectic(w: np.ndarray, J: np.ndarray, L: np.ndarray, dt
     w_out = solve(J, h_3)
     return w_out
 
+@njit(cache=True)
+def integrate_ang_vel_symplectic_adaptive(w: np.ndarray, J: np.ndarray, L: np.ndarray,
+    dt_min: float, dt_max: float, tol: float) -> tuple[np.ndarray, float]:
+    """
+    One integrate_ang_vel_symplectic step with a state-dependent time step.
+    The step is chosen so the body rotates by about tol [rad] per step,
+    dt = clip(tol / |w|, dt_min, dt_max): long steps while the body turns slowly,
+    short ones while it spins fast. The Cayley drift preserves |h| exactly for zero
+    torque whatever dt is, so the step size only affects the phase accuracy.
+
+    Inputs:
+        w: np.ndarray of shape (3,) - current angular velocity
+        J: np.ndarray of shape (3,3) - inertia matrix
+        L: np.ndarray of shape (3,) - external torque vector
+        dt_min, dt_max: float - bounds on the time step
+        tol: float - target rotation angle per step [rad]
+    Output:
+        (w_next, dt): next angular velocity and the time step that was taken
+    """
+    w_norm = np.sqrt(w[0] * w[0] + w[1] * w[1] + w[2] * w[2])
+    if w_norm * dt_max > tol:
+        dt = tol / w_norm
+    else:
+        dt = dt_max
+    dt = max(dt, dt_min)
+    return integrate_ang_vel_symplectic(w, J, L, dt), dt
+
 
 def orbit_to_inertial(r_i: np.ndarray, v_i: np.ndarray, a_i: np.ndarray) -> np.ndarray:
     """
@@ -309,3 +493,13 @@ def omega_orbit_to_inertial(r_i: np.ndarray, v_i: np.ndarray) -> np.ndarray:
 
     
 
+def _warmup() -> None:
+    """Compile state_deriv at import, with the argument types Plant.compute_states passes,
+    so the first integration does not pay for JIT. cache=True persists the result."""
+    y = np.zeros(16)
+    y[0] = 7.0e6
+    y[12] = 1.0
+    state_deriv(0.0, y, np.ones(3), np.ones(3), 0, 0.0, 0.0, np.array([0.0, 0.0, 0.0, 1.0]))
+
+
+_warmup()
@@ -27,10 +27,18 @@ class GyroSensorConfig:
 class DeterministicRNG:
     def __init__(self, seed: int):
         self.rng = np.random.default_rng(seed)
+        self._buf3 = np.empty(3)
 
     def normal(self, mean: float, sigma: float, size: Tuple[int, ...] | int) -> np.ndarray:
         return self.rng.normal(loc=mean, scale=sigma, size=size)
 
+    def normal3(self, sigma: float) -> np.ndarray:
+        """Zero-mean 3-vector with std sigma, drawn from the same stream as normal(0, sigma, 3).
+        The returned array is an internal buffer and is overwritten by the next call."""
+        self.rng.standard_normal(out=self._buf3)
+        self._buf3 *= sigma
+        return self._buf3
+
 
 class GPSSynthesizer:
     def __init__(self, cfg: GPSSensorConfig, rng: DeterministicRNG):
@@ -45,8 +53,8 @@ class GPSSynthesizer:
         self._next_emit = t_sim + 1.0 / self.cfg.rate_hz
         self.seq += 1
 
-        r_noisy = r_eci + self.rng.normal(0.0, self.cfg.sigma_pos_m, 3)
-        v_noisy = v_eci + self.rng.normal(0.0, self.cfg.sigma_vel_mps, 3)
+        r_noisy = r_eci + self.rng.normal3(self.cfg.sigma_pos_m)
+        v_noisy = v_eci + self.rng.normal3(self.cfg.sigma_vel_mps)
         msg = {
             "type": "sensor",
             "protocol_version": "1.0",
@@ -57,8 +65,8 @@ class GPSSynthesizer:
             "t_sent": None,
             "seq": self.seq,
             "payload": {
-                "r_eci": [float(x) for x in r_noisy],
-                "v_eci": [float(x) for x in v_noisy],
+                "r_eci": r_noisy.tolist(),
+                "v_eci": v_noisy.tolist(),
             },
         }
         return msg
@@ -74,7 +82,7 @@ class GyroSynthesizer:
 
     def step_bias(self):
         if self.cfg.bias_rw_sigma is not None and self.cfg.bias_rw_sigma > 0:
-            self.bias += self.rng.normal(0.0, self.cfg.bias_rw_sigma, 3)
+            self.bias += self.rng.normal3(self.cfg.bias_rw_sigma)
 
     def maybe_emit(self, t_sim: float, omega_body_true: np.ndarray) -> Optional[dict]:
         if t_sim + 1e-9 < self._next_emit:
@@ -83,7 +91,7 @@ class GyroSynthesizer:
         self.seq += 1
         self.step_bias()
 
-        noise = self.rng.normal(0.0, self.cfg.sigma_radps, 3)
+        noise = self.rng.normal3(self.cfg.sigma_radps)
         omega_meas = omega_body_true + self.bias + noise
         msg = {
             "type": "sensor",
@@ -94,7 +102,7 @@ class GyroSynthesizer:
             "t_sent": None,
             "seq": self.seq,
             "payload": {
-                "omega_body": [float(x) for x in omega_meas],
+                "omega_body": omega_meas.tolist(),
             },
         }
         return msg
@@ -9,12 +9,43 @@ import yaml
 from typing import Optional, Dict, Any
 
 from ..math import quaternion as qm
-from .dynamics import state_deriv
+from .dynamics import state_deriv, STATE_SIZE, R_SL, V_SL, W_SL, Q_SL, H_SL
 from ..math.quaternion import slerp_quat_array
 
 
 MU_EARTH = 3.986004418e14  # [m^3/s^2]
 
+# Default solve_ivp tolerances of compute_states
+DEFAULT_RTOL = 1e-9
+DEFAULT_ATOL = 1e-12
+
+# Upper bound on the compute_states output grid. dt_sim and t_max come from clients, and
+# each point holds the full state (16 float64), so 100k intervals cap a result at ~13 MB
+_MAX_OUTPUT_INTERVALS = 100_000
+
+# State rows resampled linearly for the GUI (the quaternion rows are slerped instead)
+_LINEAR_ROWS = np.r_[R_SL, V_SL, W_SL, H_SL]
+
+# Default commanded attitude (identity). Left writable on purpose: a read-only array is a
+# distinct numba type and would force a second compilation of state_deriv
+_DEFAULT_QC = np.array([0.0, 0.0, 0.0, 1.0])
+
+
+def _slerp_and_euler(t_sampled: np.ndarray, t0: np.ndarray, q0: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Slerp the (4, N) keyframes q0 at t_sampled and convert the result to Euler angles.
+    Returns (q_sampled (4, M), euler_sampled (3, M)); the Euler angles come straight from
+    the interpolated quaternions, with no intermediate rotation objects.
+    """
+    q_sampled = slerp_quat_array(t_sampled, t0, qm.quat_normalize_batch(q0))
+    # The compiled kernel is serial, so it is safe in the API's worker threads; without
+    # numba its Python loop would be slower than the broadcast version
+    if qm.NUMBA_ENABLED:
+        euler_sampled = qm.quat_to_euler_batch(q_sampled)
+    else:
+        euler_sampled = qm.quat_to_euler(q_sampled)
+    return q_sampled, euler_sampled
+
+
 class Plant:
     def __init__(self, config_path: Optional[str] = None, config: Optional[Dict[str, Any]] = None):
         if config is not None:
@@ -31,6 +62,8 @@ class Plant:
         # Simulation timing
         sim_section = cfg.get("simulation", {})
         self.dt_sim = float(sim_section.get("dt_sim", 0.1))
+        if not (np.isfinite(self.dt_sim) and self.dt_sim > 0):
+            raise ValueError(f"dt_sim must be a positive number, got {self.dt_sim}")
         self.t_sim = 0.0
 
         # Initial orbital state
@@ -39,8 +72,11 @@ class Plant:
 
 
         # Spacecraft properties
-        self.J = np.diag(cfg["spacecraft"]["inertia"]).astype(float)
-        self.Ji = np.linalg.inv(self.J)
+        # Body axes are principal inertia axes (docs/CONVENTIONS.md), so J is diagonal
+        self.J_diag = np.asarray(cfg["spacecraft"]["inertia"], dtype=np.float64)
+        self.Ji_diag = 1.0 / self.J_diag
+        self.J = np.diag(self.J_diag)
+        self.Ji = np.diag(self.Ji_diag)
 
         # Initial attitude state
         ic = cfg["initial_conditions"]
@@ -71,14 +107,31 @@ class Plant:
         # Initial reaction wheel angular momentum (aligned with principal axes)
         self.h0 = np.zeros(3, dtype=float)
 
-    def compute_states(self, t_max: float, rtol: float = 1e-12, atol: float = 1e-12, 
+        # Number of steps the solver took in the last compute_states call
+        self.n_solver_steps = 0
+
+    def compute_states(self, t_max: float, rtol: float = DEFAULT_RTOL, atol: float = DEFAULT_ATOL, 
         control_type: Optional[object] = None, kp: Optional[float] = None, 
-        kd: Optional[float] = None, qc: Optional[np.ndarray] = None) -> np.ndarray:
+        kd: Optional[float] = None, qc: Optional[np.ndarray] = None,
+        method: str = "DOP853") -> np.ndarray:
         """
         Compute the states of the plant over a given time range.
+        method is the solve_ivp integrator; the 8th-order DOP853 needs far fewer
+        state_deriv evaluations than RK45 at these tight tolerances.
+        The states are returned on a grid spaced by dt_sim, evaluated from the solver's
+        dense output, since evaluate_gui interpolates linearly / slerps between points
+        and DOP853's own steps are several seconds long. The grid is coarsened if it would
+        exceed _MAX_OUTPUT_INTERVALS.
         """
+        if not (np.isfinite(t_max) and t_max > 0):
+            raise ValueError(f"t_max must be a positive number, got {t_max}")
         t_span = (0, t_max)
-        y0 = np.hstack((self.r0, self.v0, self.w_bi, self.q_bi, self.h0))
+        y0 = np.empty(STATE_SIZE)
+        y0[R_SL] = self.r0
+        y0[V_SL] = self.v0
+        y0[W_SL] = self.w_bi
+        y0[Q_SL] = self.q_bi
+        y0[H_SL] = self.h0
         
         # Map control_type to integer expected by JITed dynamics
         def _map_control_type(ct: object) -> int:
@@ -97,13 +150,20 @@ class Plant:
         ct_int = _map_control_type(control_type)
         kp_val = float(kp) if kp is not None else 0.0
         kd_val = float(kd) if kd is not None else 0.0
-        qc_arr = np.array(qc, dtype=float) if qc is not None else np.array([0.0, 0.0, 0.0, 1.0], dtype=float)
+        qc_arr = np.ascontiguousarray(qc, dtype=np.float64) if qc is not None else _DEFAULT_QC
 
-        # Prepare args for state_deriv
-        args = (self.J, self.Ji, ct_int, kp_val, kd_val, qc_arr)
+        # Prepare args for state_deriv once: contiguous float64, so the compiled RHS
+        # is specialized a single time and needs no per-call conversion
+        J_diag = np.ascontiguousarray(self.J_diag, dtype=np.float64)
+        Ji_diag = np.ascontiguousarray(self.Ji_diag, dtype=np.float64)
+        args = (J_diag, Ji_diag, ct_int, kp_val, kd_val, qc_arr)
             
-        sol = solve_ivp(state_deriv, t_span, y0, args=args, rtol=rtol, atol=atol)
-        return sol.t, sol.y
+        sol = solve_ivp(state_deriv, t_span, y0, args=args, method=method, rtol=rtol, atol=atol,
+            dense_output=True)
+        self.n_solver_steps = int(sol.t.shape[0])
+        n_out = min(max(int(np.ceil(t_max / self.dt_sim)), 1), _MAX_OUTPUT_INTERVALS)
+        t_out = np.linspace(0.0, t_max, n_out + 1)
+        return t_out, sol.sol(t_out)
 
     def evaluate_gui(self, t, y, playback_speed: float = 1.0, sample_rate: float = 30) -> np.ndarray:
         """
@@ -112,16 +172,22 @@ class Plant:
         sample_rate is the number of samples per second.
         """
         t_sampled = np.arange(0, t[-1], playback_speed/sample_rate)
-        y_sampled = np.array([np.interp(t_sampled, t, component) for component in y[:9]])
-        r_sampled = y_sampled[0:3]  
+        # Linear interpolation of r, v, w and h: the segment index and weight are found
+        # once for all rows (same result as np.interp per component)
+        idx = np.clip(np.searchsorted(t, t_sampled, side='right') - 1, 0, t.shape[0] - 2)
+        t_left = t[idx]
+        frac = (t_sampled - t_left) / (t[idx + 1] - t_left)
+        y_lin = y[_LINEAR_ROWS]
+        # take() keeps the gathered rows C-contiguous (orjson serializes them directly)
+        y_left = y_lin.take(idx, axis=1)
+        y_sampled = y_left + (y_lin.take(idx + 1, axis=1) - y_left) * frac
+        r_sampled = y_sampled[0:3]
         v_sampled = y_sampled[3:6]
         w_sampled = y_sampled[6:9]
-        # Interpolate attitude quaternions (scalar-last [x, y, z, w])
-        q_sampled = slerp_quat_array(t_sampled, t, y[9:13])
-        # Interpolate reaction wheel angular momentum components
-        h_sampled = np.array([np.interp(t_sampled, t, component) for component in y[13:16]])
-        # Keep Euler for legacy uses if needed
-        euler_sampled = qm.quat_to_euler(q_sampled)
+        # Reaction wheel angular momentum components
+        h_sampled = y_sampled[9:12]
+        # Interpolate attitude quaternions (scalar-last [x, y, z, w]); Euler kept for legacy uses
+        q_sampled, euler_sampled = _slerp_and_euler(t_sampled, t, y[Q_SL])
         return t_sampled, r_sampled, v_sampled, euler_sampled, w_sampled, q_sampled, h_sampled
 
 
@@ -165,9 +231,10 @@ def main():
     plant = Plant(args.config)
     print(plant.q_bi)
     print(plant.w_bi)
-    for _ in range(10000):
-        euler_angles, angular_velocity = plant.update()
-        #print(f"t={plant.t_sim:.2f}, roll={euler_angles[0]:.2f}, pitch={euler_angles[1]:.2f}, yaw={euler_angles[2]:.2f}")
+    # Same span as the former 10000 fixed steps of the deprecated update(), integrated
+    # in one solve_ivp call over the compiled state_deriv
+    t, y = plant.compute_states(10000 * plant.dt_sim)
+    print(f"t={t[-1]:.2f}, q={y[Q_SL, -1]}, w={y[W_SL, -1]}")
 
 
 if __name__ == "__main__":
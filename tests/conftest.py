@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+from src.math.utils import load_protocol_schemas, SchemaRegistry
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_numba():
+    # Compile (or load from the on-disk cache) the jitted kernels the tests call, once per
+    # session, so the first test to touch them is not billed for JIT. state_deriv already
+    # warms itself when src.simulation.dynamics is imported.
+    from src.simulation.dynamics import rk4_roll_attitude, rk4_roll_orbit
+    rk4_roll_attitude(np.array([0.0, 0.0, 0.0, 1.0]), np.zeros(3), 0.1, 1)
+    rk4_roll_orbit(np.array([7.0e6, 0.0, 0.0]), np.array([0.0, 7.5e3, 0.0]), 0.1, 1)
+
+
+@pytest.fixture(scope="session")
+def schema_registry():
+    # Schema parsing and validator compilation are invariant, so pay for them once per session
+    return SchemaRegistry(load_protocol_schemas("docs/protocol_schema.json"))
@@ -0,0 +1,71 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from fastapi.testclient import TestClient
+
+from app import app
+from src.api import routes
+
+
+def _compute(client, t_max):
+    resp = client.post("/api/compute", json={"t_max": t_max, "playback_speed": 1.0, "sample_rate": 10.0})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert "error" not in body
+    return body
+
+
+def test_api_compute_returns_sampled_dataset():
+    with TestClient(app) as client:
+        body = _compute(client, 5.0)
+    dataset = body["dataset"]
+    n = len(dataset["t"])
+    assert n == 50
+    for key in ("qx", "qy", "qz", "qw", "p", "q", "r", "hx", "hy", "hz"):
+        assert len(dataset[key]) == n
+    assert body["metrics"]["num_integration_points"] > 0
+
+
+def test_api_compute_concurrent_requests():
+    # evaluate_gui runs in worker threads; distinct t_max values bypass the solver cache
+    with TestClient(app) as client, ThreadPoolExecutor(max_workers=4) as pool:
+        bodies = list(pool.map(lambda t_max: _compute(client, t_max), (4.0, 5.0, 6.0, 7.0)))
+    assert [len(b["dataset"]["t"]) for b in bodies] == [40, 50, 60, 70]
+
+
+def test_page_etag_follows_file_edits(tmp_path, monkeypatch):
+    page = tmp_path / "loading.html"
+    page.write_text("<p>v1</p>", encoding="utf-8")
+    monkeypatch.setitem(routes._PAGE_FILES, "/loading", str(page))
+    with TestClient(app) as client:
+        etag = client.get("/loading").headers["etag"]
+        assert client.get("/loading", headers={"If-None-Match": etag}).status_code == 304
+
+        page.write_text("<p>version 2</p>", encoding="utf-8")
+        resp = client.get("/loading", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.text == "<p>version 2</p>"
+    assert resp.headers["etag"] != etag
+
+
+def test_api_compute_rejects_zero_dt_sim():
+    with TestClient(app) as client:
+        resp = client.post("/api/compute", json={"t_max": 5.0, "dt_sim": 0.0})
+    assert "dt_sim" in resp.json()["error"]
+
+
+def test_websocket_sends_t_as_float64():
+    with TestClient(app) as client, client.websocket_connect("/ws") as ws:
+        ws.send_text(json.dumps({"command": "configure",
+                                 "payload": {"t_max": 5.0, "playback_speed": 1.0, "sample_rate": 10.0}}))
+        header = json.loads(ws.receive_text())
+        frames = [ws.receive_bytes() for _ in header["fields"]]
+    assert header["dtypes"][0] == "float64"
+    columns = {name: np.frombuffer(frame, dtype=dtype)
+               for name, frame, dtype in zip(header["fields"], frames, routes.DATASET_DTYPES)}
+    assert all(len(c) == header["N"] for c in columns.values())
+    # float32 would be off by ~1e-8 here
+    np.testing.assert_allclose(columns["t"], np.arange(header["N"]) / 10.0, rtol=1e-15, atol=0)
+    assert columns["qw"].dtype == np.float32
@@ -1,7 +1,7 @@
 import numpy as np
 
-from plant.dynamics import rk4_step_orbit, MU_EARTH, quaternion_normalize, quaternion_multiply, integrate_attitude_rk4
-from plant.quaternion_math import Quaternion
+from src.simulation.dynamics import (rk4_step_orbit, rk4_roll_orbit, MU_EARTH, rk4_roll_attitude,
+                                     integrate_attitude_rk4, skew, skew_batch)
 
 def specific_orbital_energy(r, v, mu=MU_EARTH):
     rnorm = np.linalg.norm(r)
@@ -14,20 +14,53 @@ def test_two_body_energy_conservation_short_run():
     e0 = specific_orbital_energy(r, v)
     dt = 0.5
     for _ in range(200):
-        r, v = rk4_step_orbit(r, v, dt)
+        r, v, _a = rk4_step_orbit(r, v, dt)
     e1 = specific_orbital_energy(r, v)
     rel_err = abs((e1 - e0) / e0)
     assert rel_err < 1e-6
 
 
+def test_rk4_roll_orbit_matches_rk4_step_orbit():
+    r0 = np.array([6871e3, 0.0, 100e3])
+    v0 = np.array([0.0, 7610.0, 50.0])
+    dt = 0.5
+    r, v = r0, v0
+    for _ in range(200):
+        r, v, _a = rk4_step_orbit(r, v, dt)
+    r_roll, v_roll = rk4_roll_orbit(r0, v0, dt, 200)
+    np.testing.assert_allclose(r_roll, r, rtol=1e-14, atol=0)
+    np.testing.assert_allclose(v_roll, v, rtol=1e-14, atol=0)
+
+
 def test_attitude_integration_constant_rate():
-    q = Quaternion(0.0, 0.0, 0.0, 1.0)
+    q = np.array([0.0, 0.0, 0.0, 1.0])
     w = np.array([0.01, 0.0, 0.0])
     dt = 0.1
     for _ in range(100):
         q = integrate_attitude_rk4(q, w, dt)
-        print(q)
-    assert np.isclose(q.norm, 1.0)
+    assert np.isclose(np.linalg.norm(q), 1.0)
+
+
+def test_rk4_roll_attitude_matches_integrate_attitude_rk4():
+    q0 = np.array([0.1, -0.2, 0.3, 0.9])
+    q0 /= np.linalg.norm(q0)
+    w = np.array([0.05, -0.02, 0.1])
+    dt = 0.1
+    np.testing.assert_allclose(rk4_roll_attitude(q0, w, dt, 1), integrate_attitude_rk4(q0, w, dt),
+                               rtol=0, atol=1e-15)
 
+    q = rk4_roll_attitude(q0, w, dt, 100)
+    assert np.isclose(np.linalg.norm(q), 1.0)
 
 
+def test_skew_batch_matches_skew():
+    rng = np.random.default_rng(3)
+    V = rng.normal(size=(5, 4, 3))
+    S = skew_batch(V)
+    assert S.shape == (5, 4, 3, 3)
+    for idx in np.ndindex(V.shape[:-1]):
+        np.testing.assert_array_equal(S[idx], skew(V[idx]))
+    # a single vector gives a single matrix, and v x u = skew(v) @ u
+    v, u = V[0, 0], V[1, 1]
+    np.testing.assert_array_equal(skew_batch(v), skew(v))
+    np.testing.assert_allclose(skew_batch(v) @ u, np.cross(v, u), rtol=1e-14)
@@ -0,0 +1,61 @@
+import numpy as np
+
+from src.math.quaternion_class import Quaternion
+from src.math.quaternion import quat_to_euler, quat_to_euler_batch, propagate_quats
+from src.simulation.dynamics import integrate_attitude_quat_mult
+
+
+def _random_unit_quats(n, seed=0):
+    q = np.random.default_rng(seed).standard_normal((4, n))
+    return q / np.linalg.norm(q, axis=0)
+
+
+def test_quat_to_euler_batch_matches_quat_to_euler():
+    q = _random_unit_quats(1000)
+    np.testing.assert_allclose(quat_to_euler_batch(q), quat_to_euler(q), rtol=0, atol=1e-12)
+
+
+def test_quat_to_euler_batch_clamps_pitch_at_gimbal_lock():
+    # +-90 deg about y, scaled slightly above unit norm so |sin(pitch)| exceeds 1 by round-off
+    s = np.sqrt(0.5) * (1 + 1e-12)
+    q = np.array([[0.0, 0.0], [s, -s], [0.0, 0.0], [s, s]])
+    euler = quat_to_euler_batch(q)
+    assert not np.isnan(euler).any()
+    np.testing.assert_allclose(euler[1], [-np.pi / 2, np.pi / 2], rtol=0, atol=1e-12)
+    np.testing.assert_allclose(euler[1], quat_to_euler(q)[1], rtol=0, atol=1e-12)
+
+
+def _propagation_inputs(n=64):
+    q = _random_unit_quats(n, seed=1)
+    omega = np.random.default_rng(2).standard_normal((3, n)) * 0.5
+    return q, omega, 0.1
+
+
+def test_propagate_quats_matches_integrate_attitude_quat_mult():
+    q, omega, dt = _propagation_inputs()
+    expected = np.column_stack([integrate_attitude_quat_mult(q[:, i], omega[:, i], dt)
+                                for i in range(q.shape[1])])
+    np.testing.assert_allclose(propagate_quats(q, omega, dt), expected, rtol=0, atol=1e-14)
+
+    out = np.empty_like(q)
+    result = propagate_quats(q, omega, dt, out=out)
+    assert result is out
+    np.testing.assert_allclose(out, expected, rtol=0, atol=1e-14)
+
+
+def test_propagate_quats_stays_unit_norm():
+    q, omega, dt = _propagation_inputs()
+    for _ in range(1000):
+        q = propagate_quats(q, omega, dt, out=q)
+    np.testing.assert_allclose(np.linalg.norm(q, axis=0), 1.0, rtol=0, atol=1e-14)
+
+
+def test_quaternion_equality_matches_allclose():
+    base = np.array([100.0, -200.0, 300.0, 400.0])
+    for delta in (0.0, 1e-9, 1e-4, 1e-2):
+        other = base + delta
+        assert (Quaternion(base) == Quaternion(other)) == np.allclose(base, other)
+    # The relative term admits differences well above atol on large components
+    assert Quaternion(base) == Quaternion(base + 1e-4)
+    assert Quaternion(0.0, 0.0, 0.0, 1.0) == Quaternion(0.0, 0.0, 0.0, 1.0 + 1e-6)
+    assert Quaternion(0.0, 0.0, 0.0, 1.0) != Quaternion(0.0, 0.0, 0.0, 1.0 + 1e-4)
@@ -3,8 +3,7 @@ from pathlib import Path
 
 import numpy as np
 
-from plant.sensors import DeterministicRNG, GPSSensorConfig, GyroSensorConfig, GPSSynthesizer, GyroSynthesizer
-from plant.utils import load_protocol_schemas, SchemaRegistry
+from src.simulation.sensors import DeterministicRNG, GPSSensorConfig, GyroSensorConfig, GPSSynthesizer, GyroSynthesizer
 
 
 def test_deterministic_rng_repeatability():
@@ -13,12 +12,11 @@ def test_deterministic_rng_repeatability():
     rng2 = DeterministicRNG(seed)
     a = rng1.normal(0.0, 1.0, 5)
     b = rng2.normal(0.0, 1.0, 5)
-    assert np.allclose(a, b)
+    assert np.array_equal(a, b)
 
 
-def test_message_schema_validation(tmp_path):
-    schemas = load_protocol_schemas("docs/protocol_schema.json")
-    reg = SchemaRegistry(schemas)
+def test_message_schema_validation(tmp_path, schema_registry):
+    reg = schema_registry
 
     rng = DeterministicRNG(1)
     gps = GPSSynthesizer(GPSSensorConfig(rate_hz=1.0, sigma_pos_m=1.0, sigma_vel_mps=0.1), rng)
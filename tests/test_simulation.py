@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from src.simulation import simulation
+from src.simulation.simulation import Plant
+
+
+def _config(dt_sim):
+    return {
+        "simulation": {"dt_sim": dt_sim},
+        "spacecraft": {"inertia": [1.0, 2.0, 3.0]},
+        "initial_conditions": {
+            "r_eci_m": [6871e3, 0.0, 0.0],
+            "v_eci_mps": [0.0, 7610.0, 0.0],
+            "q_bi": [0.0, 0.0, 0.0, 1.0],
+            "omega_bi_radps": [0.01, 0.02, 0.03],
+        },
+    }
+
+
+def test_compute_states_output_grid_follows_dt_sim():
+    t, y = Plant(config=_config(0.1)).compute_states(5.0)
+    assert t.shape == (51,)
+    assert y.shape == (16, 51)
+    assert np.allclose(np.diff(t), 0.1)
+
+
+def test_compute_states_caps_output_grid():
+    # 1e-6 s spacing over 10 s would be 1e7 points (1.3 GB of state)
+    plant = Plant(config=_config(1e-6))
+    t, y = plant.compute_states(10.0)
+    assert t.shape == (simulation._MAX_OUTPUT_INTERVALS + 1,)
+    assert y.shape == (16, t.shape[0])
+    assert t[-1] == 10.0
+    assert plant.n_solver_steps < t.shape[0]
+
+
+@pytest.mark.parametrize("dt_sim", [0.0, -0.1, float("nan"), float("inf")])
+def test_plant_rejects_invalid_dt_sim(dt_sim):
+    with pytest.raises(ValueError, match="dt_sim"):
+        Plant(config=_config(dt_sim))
+
+
+@pytest.mark.parametrize("t_max", [0.0, -1.0, float("nan")])
+def test_compute_states_rejects_invalid_t_max(t_max):
+    with pytest.raises(ValueError, match="t_max"):
+        Plant(config=_config(0.1)).compute_states(t_max)
@@ -0,0 +1,24 @@
+"""Post-processing shared by the validation scripts."""
+import numpy as np
+
+
+def analyze_state(w: np.ndarray, J: np.ndarray) -> dict:
+    """
+    Angular velocity histories used in the torque-free validation plots.
+    Inputs:
+        w: np.ndarray of shape (3, N) - angular velocity history (e.g. y[W_SL])
+        J: np.ndarray of shape (3,3) - inertia matrix
+    Output:
+        dict of (N,) arrays: w_x, w_y, w_z, w_t (transverse norm), w_norm, h_norm
+    """
+    # Square once; the transverse and full norms share the x/y terms
+    w2 = w * w
+    wt2 = w2[0] + w2[1]
+    return {
+        "w_x": w[0],
+        "w_y": w[1],
+        "w_z": w[2],
+        "w_t": np.sqrt(wt2),
+        "w_norm": np.sqrt(wt2 + w2[2]),
+        "h_norm": np.linalg.norm(J @ w, axis=0),
+    }
@@ -2,13 +2,12 @@ import numpy as np
 import sys
 import os
 
-# Add the plant directory to the path (relative to this script's location)
+# Add the project root to the path (relative to this script's location)
 script_dir = os.path.dirname(os.path.abspath(__file__))
-plant_dir = os.path.join(script_dir, '..', 'plant')
-sys.path.insert(0, plant_dir)
+sys.path.insert(0, os.path.join(script_dir, '..'))
 
-from quaternion_math import Quaternion
-from dynamics import integrate_attitude_quat_mult
+from src.math.quaternion import quat_conj, quat_multiply_cross
+from src.simulation.dynamics import integrate_attitude_quat_mult
 
 # Test parameters
 omega_b = np.array([0.0, 0.0, 1.0])  # rad/s, spin about z-axis
@@ -16,26 +15,28 @@ dt = 0.1                             # s
 steps = 100                          # total integration steps
 T = steps * dt                       # total time
 
-# Initial attitude (identity quaternion)
-q = Quaternion(0, 0, 0, 1)
+# Initial attitude (identity quaternion), as a flat scalar-last array
+q = np.array([0.0, 0.0, 0.0, 1.0])
 
-# Store results
-q_history = [q]
+# Store results, one quaternion per row
+q_history = np.empty((steps + 1, 4))
+q_history[0] = q
 
-for _ in range(steps):
+for i in range(steps):
     q = integrate_attitude_quat_mult(q, omega_b, dt)
-    q_history.append(q)
+    q_history[i + 1] = q
 
 # Analytic solution: rotation about z-axis by angle = omega * T
 theta_true = np.linalg.norm(omega_b) * T
-q_true = Quaternion(
+q_true = np.array([
     0.0,
     0.0,
     np.sin(theta_true / 2),
     np.cos(theta_true / 2)
-)
+])
 
 print("Final integrated quaternion:", q_history[-1])
 print("Analytic quaternion:", q_true)
-print("Angle error (rad):", 2 * np.arccos(np.clip(np.abs(q_history[-1].q[3,0]*q_true.q[3,0] +
-                                                          np.dot(q_history[-1].q[:3,0], q_true.q[:3,0])), -1.0, 1.0)))
+# Rotation angle of the error quaternion; atan2 stays well conditioned near zero error
+q_rel = quat_multiply_cross(quat_conj(q_true), q_history[-1])
+print("Angle error (rad):", 2 * np.arctan2(np.linalg.norm(q_rel[:3]), abs(q_rel[3])))
@@ -1,6 +1,6 @@
-import numpy as np
 import sys
 import os
+import yaml
 from matplotlib import pyplot as plt
 
 
@@ -16,44 +16,37 @@ h_norm is constant throughout which is good.
 
 """
 
-# Add the parent directory to the path (so 'plant' is recognized as a package)
+# Add the parent directory to the path (so 'src' is recognized as a package)
 script_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(script_dir)  # This is the project root
 sys.path.insert(0, parent_dir)
 
-from plant.sim import Plant
+from src.simulation.dynamics import W_SL
+from src.simulation.simulation import Plant
 
-plant = Plant('plant/config_default.yaml')
+from _analysis import analyze_state
 
-w_x_history = []
-w_y_history = []
-w_z_history = []
-w_t_history = []
-w_norm_history = []
-h_norm_history = []
+with open(os.path.join(parent_dir, 'configs', 'config_intermediateaxis.yaml'), 'r', encoding='utf-8') as f:
+    cfg = yaml.safe_load(f)
+cfg['initial_conditions']['q_bi'] = [0.0, 0, 0.0, 1]
+cfg['initial_conditions']['omega_bi_radps'] = [0.05, 0.04, 0.1]
+plant = Plant(config=cfg)
 
-for _ in range(10000):
-    euler_angles, angular_velocity = plant.update()
-    w_x_history.append(angular_velocity[0])
-    w_y_history.append(angular_velocity[1])
-    w_z_history.append(angular_velocity[2])
-    w_t_history.append(np.linalg.norm(angular_velocity[:2]))
-    w_norm_history.append(np.linalg.norm(angular_velocity))
-    h_norm_history.append(np.linalg.norm(plant.J @ angular_velocity))
+# Same span as 10000 steps of the deprecated plant.update(), in one compiled integration
+t, y = plant.compute_states(10000 * plant.dt_sim)
+hist = analyze_state(y[W_SL], plant.J)
 
 
 fig, ax = plt.subplots()
-ax.plot(w_x_history)
-ax.plot(w_y_history)
-ax.plot(w_z_history)
-ax.plot(w_t_history)
-ax.plot(w_norm_history)
+ax.plot(t, hist["w_x"])
+ax.plot(t, hist["w_y"])
+ax.plot(t, hist["w_z"])
+ax.plot(t, hist["w_t"])
+ax.plot(t, hist["w_norm"])
 ax.legend(['w_x', 'w_y', 'w_z', 'w_t', 'w_norm'])
 
 fig, ax = plt.subplots()
-ax.plot(h_norm_history)
+ax.plot(t, hist["h_norm"])
 ax.legend(['h_norm'])
 
 plt.show()
-
-
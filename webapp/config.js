@@ -103,7 +103,7 @@ async function init() {
     const tmax = sim.t_max ?? 1000.0;
     const play = sim.playback_speed ?? 1.0;
     const sr = sim.sample_rate ?? 30.0;
-    const rtol = sim.rtol ?? 1e-12;
+    const rtol = sim.rtol ?? 1e-9;
     const atol = sim.atol ?? 1e-12;
     const control = saved.control || defaults.control || { control_type: 'none', kp: 0.0, kd: 0.0, qc: [0,0,0,1] };
     
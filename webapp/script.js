@@ -271,6 +271,7 @@ function rebuildSeriesUpTo(index) {
 const wsScheme = window.location.protocol === 'https:' ? 'wss' : 'ws';
 const wsHost = window.location.host;
 const socket = new WebSocket(`${wsScheme}://${wsHost}/ws`);
+socket.binaryType = 'arraybuffer';
 let dataset = null;
 let metrics = null;
 let frameIndex = 0;
@@ -487,9 +488,42 @@ socket.onopen = () => {
     }
 };
 
+// Header of the dataset being received, and the binary frames received so far (one per field)
+let pendingDatasetHeader = null;
+let pendingDatasetFrames = [];
+
+function datasetFromFrames(header, frames) {
+    const data = {
+        sample_rate: header.sample_rate,
+        earth_initial_sidereal_angle_rad: header.earth_initial_sidereal_angle_rad,
+        earth_spin_rate_radps: header.earth_spin_rate_radps,
+    };
+    // t arrives as float64, the other fields as float32 (see header.dtypes)
+    header.fields.forEach((name, k) => {
+        const ArrayType = header.dtypes[k] === 'float64' ? Float64Array : Float32Array;
+        data[name] = new ArrayType(frames[k]);
+    });
+    return data;
+}
+
 socket.onmessage = (event) => {
+    if (event.data instanceof ArrayBuffer) {
+        if (!pendingDatasetHeader) return;
+        pendingDatasetFrames.push(event.data);
+        if (pendingDatasetFrames.length === pendingDatasetHeader.fields.length) {
+            const header = pendingDatasetHeader;
+            const frames = pendingDatasetFrames;
+            pendingDatasetHeader = null;
+            pendingDatasetFrames = [];
+            startPlaybackFromDataset(datasetFromFrames(header, frames), header.metrics || null);
+        }
+        return;
+    }
     const msg = JSON.parse(event.data);
-    if (msg.dataset) {
+    if (msg.kind === 'dataset') {
+        pendingDatasetHeader = msg;
+        pendingDatasetFrames = [];
+    } else if (msg.dataset) {
         startPlaybackFromDataset(msg.dataset, msg.metrics || null);
     }
 };